@@ -0,0 +1 @@
+"""Общие части решателей игры в пятнашки (8-puzzle) для лабораторных работ"""
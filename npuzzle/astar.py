@@ -0,0 +1,78 @@
+"""A* и жадный поиск по упакованным состояниям без объектов Node.
+
+Кайма — куча (f, -g, счетчик, состояние, пустая клетка, h), лучшие
+известные g и ссылки на родителей — словари по состоянию. Подходит для
+пакетного решения, где не нужен пошаговый вывод.
+"""
+import heapq
+from itertools import count
+
+from npuzzle import board
+
+
+class AStar:
+    def __init__(self, start: int, goal: int, heuristic,
+                 rows: int = board.ROWS, cols: int = board.COLS,
+                 greedy: bool = False):
+        """heuristic — эвристика с пересчетом после хода (см.
+        npuzzle.heuristics); greedy=True упорядочивает кайму только по h"""
+        self.start, self.goal = start, goal
+        self.heuristic = heuristic
+        self.greedy = greedy
+        self.moves = board.move_table(rows, cols)
+        self.size = rows * cols
+        self.bits = board.cell_bits(self.size)
+        self.solvable = board.solvable(start, goal, rows, cols)
+        # состояние -> (родительское состояние, код действия), у корня None
+        self.parents: dict[int, tuple[int, int] | None] = {start: None}
+        self.count_new_states = 0  # количество полученных новых состояний
+        self.expanded = 0  # раскрытых вершин
+
+    @property
+    def stored(self) -> int:
+        """Количество состояний, достигнутых поиском"""
+        return len(self.parents)
+
+    def run(self) -> list[tuple[int, int | None]]:
+        """Путь от start до goal: пары (состояние, код действия). Для A* с
+        допустимой эвристикой путь оптимален"""
+        if not self.solvable:
+            raise Exception('нет решения !!!')
+        moves, parents, heuristic = self.moves, self.parents, self.heuristic
+        start, bits = self.start, self.bits
+        h = heuristic(start)
+        best_g = {start: 0}
+        tie = count()
+        # при равных f первой раскрывается более глубокая вершина
+        nodes = [(h, 0, next(tie), start,
+                  board.blank_index(start, self.size), h)]
+        while nodes:
+            _, neg_g, _, state, blank, h = heapq.heappop(nodes)
+            g = -neg_g
+            if g > best_g[state]:
+                continue  # устаревшая запись: состояние уже найдено короче
+            if state == self.goal:
+                return self._path(state)
+            self.expanded += 1
+            g += 1
+            for code, new_blank in moves[blank]:
+                new_state = board.move(state, blank, new_blank, bits)
+                self.count_new_states += 1
+                if best_g.get(new_state, g + 1) <= g:
+                    continue
+                best_g[new_state] = g
+                parents[new_state] = (state, code)
+                new_h = heuristic.update(h, state, blank, new_blank)
+                priority = new_h if self.greedy else g + new_h
+                heapq.heappush(nodes, (priority, -g, next(tie), new_state,
+                                       new_blank, new_h))
+        raise Exception('нет решения !!!')
+
+    def _path(self, state: int) -> list[tuple[int, int | None]]:
+        path = []
+        while state is not None:
+            link = self.parents[state]
+            path.append((state, link[1] if link else None))
+            state = link[0] if link else None
+        path.reverse()
+        return path
@@ -0,0 +1,148 @@
+"""Пакетное решение: много пар (начальное, целевое) по процессам.
+
+Пары группируются в порции по chunksize и раздаются в ProcessPoolExecutor;
+результаты отдаются по мере готовности порций. Решатели работают без
+вывода — счетчики попадают в Result.
+"""
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from itertools import islice
+
+from npuzzle import board, distance, heuristics
+from npuzzle.astar import AStar
+from npuzzle.bidirectional import BidirectionalSearch
+from npuzzle.idastar import ida_star
+
+
+class Result:
+    """Результат решения одной пары"""
+
+    def __init__(self, index, start, goal):
+        self.index = index  # номер пары во входной последовательности
+        self.start, self.goal = start, goal
+        self.path = None  # пары (состояние, код действия) или None
+        self.count_new_states = 0  # количество полученных новых состояний
+        self.stored = 0  # сколько вершин хранилось
+        self.seconds = 0.0
+        self.error = None  # текст ошибки, если решения нет
+
+    def __repr__(self):
+        length = len(self.path) - 1 if self.path is not None else None
+        return (f"Задача {self.index}: длина решения: {length}, "
+                f"Время выполнения: {self.count_new_states}, "
+                f"Использование памяти: {self.stored}, "
+                f"Секунд: {self.seconds:.4f}"
+                + (f", ошибка: {self.error}" if self.error else ""))
+
+
+def _astar(start, goal, heuristic, rows, cols, greedy=False):
+    search = AStar(start, goal,
+                   heuristics.heuristic(heuristic, goal, rows, cols),
+                   rows, cols, greedy)
+    return search.run(), search.count_new_states, search.stored
+
+
+def _greedy(start, goal, heuristic, rows, cols):
+    return _astar(start, goal, heuristic, rows, cols, greedy=True)
+
+
+def _ida_star(start, goal, heuristic, rows, cols):
+    iterations = []
+    path = ida_star(start, goal,
+                    heuristics.heuristic(heuristic, goal, rows, cols),
+                    rows, cols, on_iteration=iterations.append)
+    return (path, sum(it.count_new_states for it in iterations),
+            max(it.max_path for it in iterations))
+
+
+def _bidirectional(start, goal, heuristic, rows, cols):
+    search = BidirectionalSearch(start, goal, rows, cols)
+    return search.run(), search.count_new_states, search.stored
+
+
+_distance_table = lru_cache(maxsize=None)(distance.load)
+
+
+def _distance(start, goal, heuristic, rows, cols):
+    return _distance_table(goal, rows, cols).solve(start), 0, 0
+
+
+# решатель(start, goal, эвристика, rows, cols) -> (путь, новых состояний,
+# хранимых вершин)
+SOLVERS = {
+    "astar": _astar,
+    "greedy": _greedy,
+    "idastar": _ida_star,
+    "bidirectional": _bidirectional,
+    "distance": _distance,
+}
+
+
+def solve(index, start, goal, algorithm="astar", heuristic="manhattan",
+          rows=board.ROWS, cols=board.COLS) -> Result:
+    """Решение одной пары упакованных состояний"""
+    result = Result(index, start, goal)
+    start_time = time.perf_counter()
+    try:
+        result.path, result.count_new_states, result.stored = (
+            SOLVERS[algorithm](start, goal, heuristic, rows, cols))
+    except Exception as e:
+        result.error = str(e)
+    result.seconds = time.perf_counter() - start_time
+    return result
+
+
+def _solve_chunk(chunk, algorithm, heuristic, rows, cols) -> list[Result]:
+    return [solve(index, start, goal, algorithm, heuristic, rows, cols)
+            for index, start, goal in chunk]
+
+
+def solve_batch(pairs, algorithm="astar", heuristic="manhattan",
+                rows=board.ROWS, cols=board.COLS, workers=None,
+                chunksize=64):
+    """Генератор результатов для пар (start, goal) — упакованных состояний
+    или кортежей строк поля. Результаты идут в порядке готовности, номер
+    пары — Result.index. В работе одновременно не больше 2 * workers
+    порций, так что pairs может быть сколь угодно длинным итератором"""
+    if algorithm not in SOLVERS:
+        raise ValueError(f"Неизвестный алгоритм: {algorithm}. Доступны: "
+                         f"{', '.join(SOLVERS)}")
+    pairs = ((index, _packed(start), _packed(goal))
+             for index, (start, goal) in enumerate(pairs))
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as executor:
+        limit = 2 * workers
+        running = set()
+        while True:
+            while len(running) < limit:
+                chunk = list(islice(pairs, chunksize))
+                if not chunk:
+                    break
+                running.add(executor.submit(_solve_chunk, chunk, algorithm,
+                                            heuristic, rows, cols))
+            if not running:
+                return
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def _packed(state) -> int:
+    return state if isinstance(state, int) else board.pack(state)
+
+
+def random_solvable(goal: int, rows: int = board.ROWS, cols: int = board.COLS,
+                    rng=random) -> int:
+    """Случайное поле, из которого достижима цель goal: случайная
+    перестановка, при неверной четности — обмен двух фишек"""
+    cells = board.cells(goal, rows * cols)
+    rng.shuffle(cells)
+    state = board.pack([cells])
+    if not board.solvable(state, goal, rows, cols):
+        i, j = [i for i, tile in enumerate(cells) if tile][:2]
+        cells[i], cells[j] = cells[j], cells[i]
+        state = board.pack([cells])
+    return state
@@ -0,0 +1,335 @@
+"""Прогон алгоритмов на наборах задач (npuzzle.instances) и сравнение
+прогонов.
+
+Каждая пара (алгоритм, эвристика) сначала прогревается warmup раз на первой
+задаче набора, затем каждая задача решается repeats раз; в отчет идет
+медиана времени. Пиковая память (tracemalloc) замеряется отдельным
+прогоном, чтобы трассировка не искажала время. Поиск вслепую (bfs,
+dfs_limited — итеративное углубление) берет только задачи с известной
+оптимальной длиной не больше MAX_BLIND: глубже каждая задача решается
+секунды, а с прогревом, повторами и замером памяти — минуты.
+
+Сравнение двух ревизий git:
+
+    git worktree add /tmp/old <ревизия>
+    (cd /tmp/old && python -m npuzzle.bench run --output old.json)
+    python -m npuzzle.bench run --output new.json
+    python -m npuzzle.bench compare /tmp/old/old.json new.json
+
+compare печатает отношение времени new/old и изменения числа вершин по
+каждой задаче; код возврата 1, если есть регрессии.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from npuzzle import board, heuristics, instances, search
+from npuzzle.astar import AStar
+from npuzzle.idastar import ida_star
+from npuzzle.metrics import Metrics
+
+MAX_BLIND = 20  # наибольшая оптимальная длина задач для bfs и dfs_limited
+
+
+class Solver:
+    """Алгоритм для прогона: run(instance, heuristic, metrics) -> длина
+    решения; счетчики вершин записываются в metrics"""
+
+    def __init__(self, run, informed: bool = True, sizes=None,
+                 max_optimal: int | None = None):
+        self.run = run
+        self.informed = informed  # нужна ли эвристика
+        self.sizes = sizes  # допустимые (rows, cols), None — любые
+        # наибольшая оптимальная длина задачи, None — любая; задачи с
+        # неизвестной длиной при заданном пороге пропускаются
+        self.max_optimal = max_optimal
+
+    def fits(self, instance) -> bool:
+        if (self.sizes is not None
+                and (instance.rows, instance.cols) not in self.sizes):
+            return False
+        return self.max_optimal is None or (
+            instance.optimal is not None
+            and instance.optimal <= self.max_optimal)
+
+
+def _blind(instance, metrics, algorithm):
+    """search.solve без эвристики на задаче набора"""
+    rows, cols = instance.rows, instance.cols
+    path = search.solve(board.unpack(instance.start, rows, cols),
+                        board.unpack(instance.goal, rows, cols), algorithm,
+                        None, metrics=metrics, rows=rows, cols=cols)
+    return len(path) - 1
+
+
+def _bfs(instance, heuristic, metrics):
+    return _blind(instance, metrics, "bfs")
+
+
+def _dfs_limited(instance, heuristic, metrics):
+    return _blind(instance, metrics, "iddfs")
+
+
+def _astar(instance, heuristic, metrics, greedy=False):
+    search = AStar(instance.start, instance.goal,
+                   heuristics.heuristic(heuristic, instance.goal,
+                                        instance.rows, instance.cols),
+                   instance.rows, instance.cols, greedy)
+    path = search.run()
+    metrics.generated = search.count_new_states
+    metrics.expanded = search.expanded
+    metrics.peak_visited = search.stored
+    return len(path) - 1
+
+
+def _greedy(instance, heuristic, metrics):
+    return _astar(instance, heuristic, metrics, greedy=True)
+
+
+def _ida_star(instance, heuristic, metrics):
+    iterations = []
+    path = ida_star(instance.start, instance.goal,
+                    heuristics.heuristic(heuristic, instance.goal,
+                                         instance.rows, instance.cols),
+                    instance.rows, instance.cols,
+                    on_iteration=iterations.append)
+    metrics.generated = sum(it.count_new_states for it in iterations)
+    metrics.expanded = sum(it.expanded for it in iterations)
+    metrics.peak_frontier = max(it.max_path for it in iterations)
+    return len(path) - 1
+
+
+SOLVERS = {
+    "bfs": Solver(_bfs, informed=False, max_optimal=MAX_BLIND),
+    "dfs_limited": Solver(_dfs_limited, informed=False,
+                          max_optimal=MAX_BLIND),
+    "astar": Solver(_astar),
+    "greedy": Solver(_greedy),
+    "idastar": Solver(_ida_star),
+}
+
+
+def measure(solver: Solver, instance, heuristic, repeats: int = 1,
+            memory: bool = True) -> dict:
+    """Запись прогона одной задачи"""
+    record = {
+        "instance": instance.name,
+        "optimal": instance.optimal,
+        "heuristic": heuristic,
+    }
+    seconds = []
+    try:
+        for _ in range(repeats):
+            metrics = Metrics()
+            start_time = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                length = solver.run(instance, heuristic, metrics)
+            seconds.append(time.perf_counter() - start_time)
+        peak = None
+        if memory:
+            tracemalloc.start()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    solver.run(instance, heuristic, Metrics())
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    except Exception as e:
+        record["error"] = str(e)
+        return record
+    record.update(length=length, seconds=statistics.median(seconds),
+                  seconds_all=seconds, expanded=metrics.expanded,
+                  generated=metrics.generated, peak_memory=peak)
+    return record
+
+
+def run(solvers: dict, instance_set: list, algorithms, heuristic_names,
+        repeats: int = 3, warmup: int = 1, memory: bool = True, log=print):
+    """Генератор записей по всем задачам для каждого алгоритма и
+    эвристики. Задачи неподходящего размера или длины (Solver.fits)
+    пропускаются"""
+    for algorithm in algorithms:
+        solver = solvers[algorithm]
+        cases = [instance for instance in instance_set
+                 if solver.fits(instance)]
+        if not cases:
+            log(f"{algorithm}: нет задач подходящего размера и длины")
+            continue
+        for heuristic in (heuristic_names if solver.informed else [None]):
+            for _ in range(warmup):
+                measure(solver, cases[0], heuristic, memory=False)
+            for instance in cases:
+                record = measure(solver, instance, heuristic, repeats,
+                                 memory)
+                record["algorithm"] = algorithm
+                log(format_record(record))
+                yield record
+
+
+def format_record(record: dict) -> str:
+    label = (f"{record['algorithm']:<14} {str(record['heuristic']):<26} "
+             f"{record['instance']:<16}")
+    if "error" in record:
+        return f"{label} ошибка: {record['error']}"
+    peak = record["peak_memory"]
+    return (f"{label} длина: {record['length']:>3} "
+            f"(оптимум {record['optimal']}), "
+            f"время: {record['seconds']:.4f} с, "
+            f"раскрыто: {record['expanded']}, "
+            f"порождено: {record['generated']}, "
+            f"память: "
+            + (f"{peak / 1024**2:.2f} MB" if peak is not None else "-"))
+
+
+def summary(records) -> list[str]:
+    """Итог по парам (алгоритм, эвристика): суммарное время, среднее число
+    раскрытых вершин, доля оптимальных решений"""
+    groups: dict[tuple, list[dict]] = {}
+    for record in records:
+        if "error" not in record:
+            key = (record["algorithm"], str(record["heuristic"]))
+            groups.setdefault(key, []).append(record)
+    lines = []
+    for (algorithm, heuristic), group in groups.items():
+        optimal = sum(record["length"] == record["optimal"]
+                      for record in group)
+        lines.append(
+            f"{algorithm:<14} {heuristic:<26} задач: {len(group)}, "
+            f"время: {sum(r['seconds'] for r in group):.3f} с, "
+            f"раскрыто в среднем: "
+            f"{statistics.mean(r['expanded'] for r in group):.0f}, "
+            f"оптимальных: {optimal}/{len(group)}")
+    return lines
+
+
+def revision() -> str | None:
+    """Текущая ревизия git (с пометкой -dirty), если запуск из репозитория"""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=Path(__file__).resolve().parent, capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old: dict, new: dict, threshold: float = 0.1,
+            min_seconds: float = 0.01) -> list[str]:
+    """Строки сравнения двух прогонов. Регрессия — время выросло больше
+    чем в 1 + threshold раз и больше чем на min_seconds (короткие замеры
+    шумят), решение стало длиннее или вершин стало больше"""
+    def key(record):
+        return (record["algorithm"], str(record["heuristic"]),
+                record["instance"])
+
+    before = {key(record): record for record in old["runs"]}
+    lines, ratios, regressions = [], [], 0
+    for record in new["runs"]:
+        previous = before.get(key(record))
+        if previous is None or "error" in record or "error" in previous:
+            continue
+        ratio = record["seconds"] / previous["seconds"]
+        ratios.append(ratio)
+        problems = []
+        if (ratio > 1 + threshold
+                and record["seconds"] - previous["seconds"] > min_seconds):
+            problems.append("время")
+        if record["length"] > previous["length"]:
+            problems.append("длина")
+        if record["expanded"] > previous["expanded"]:
+            problems.append("вершины")
+        regressions += bool(problems)
+        lines.append(
+            f"{' '.join(map(str, key(record))):<56} "
+            f"время x{ratio:.2f}, "
+            f"раскрыто {previous['expanded']} -> {record['expanded']}"
+            + (f"  РЕГРЕССИЯ: {', '.join(problems)}" if problems else ""))
+    if ratios:
+        lines.append(f"среднее геометрическое отношения времени: "
+                     f"{statistics.geometric_mean(ratios):.3f}, "
+                     f"регрессий: {regressions} из {len(ratios)}")
+    return lines
+
+
+def parse_args(argv, solvers: dict):
+    parser = argparse.ArgumentParser(
+        prog="python -m npuzzle.bench",
+        description="Сравнение алгоритмов на наборах задач")
+    commands = parser.add_subparsers(dest="command", required=True)
+    bench = commands.add_parser("run", help="прогнать набор задач")
+    bench.add_argument("--set", default="random8",
+                       choices=sorted(instances.SETS))
+    bench.add_argument("--algorithms",
+                       help=f"через запятую из: {', '.join(solvers)} "
+                            "(по умолчанию все, для korf100 — idastar: "
+                            "кайма A* 15-puzzle не помещается в память)")
+    bench.add_argument("--heuristics", default="manhattan",
+                       help="через запятую из: "
+                            f"{', '.join(heuristics.HEURISTICS)}")
+    bench.add_argument("--repeats", type=int, default=3)
+    bench.add_argument("--warmup", type=int, default=1)
+    bench.add_argument("--limit", type=int,
+                       help="взять только первые задачи набора")
+    bench.add_argument("--per-depth", type=int, default=10,
+                       help="задач на длину в random8")
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--no-memory", action="store_true",
+                       help="не замерять пиковую память")
+    bench.add_argument("--output", help="файл JSON с результатами")
+    diff = commands.add_parser("compare", help="сравнить два прогона")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument("--threshold", type=float, default=0.1,
+                      help="допустимый рост времени, доля")
+    diff.add_argument("--min-seconds", type=float, default=0.01,
+                      help="рост времени меньше этого не считается")
+    return parser.parse_args(argv)
+
+
+def main(argv=None, solvers: dict = SOLVERS) -> int:
+    args = parse_args(argv, solvers)
+    if args.command == "compare":
+        with open(args.old, encoding="utf-8") as f:
+            old = json.load(f)
+        with open(args.new, encoding="utf-8") as f:
+            new = json.load(f)
+        lines = compare(old, new, args.threshold, args.min_seconds)
+        print(*lines, sep="\n")
+        return int(any("РЕГРЕССИЯ" in line for line in lines))
+
+    algorithms = (args.algorithms.split(",") if args.algorithms
+                  else ["idastar"] if args.set == "korf100" else solvers)
+    for algorithm in algorithms:
+        if algorithm not in solvers:
+            raise SystemExit(f"Неизвестный алгоритм: {algorithm}. "
+                             f"Доступны: {', '.join(solvers)}")
+    if args.set == "random8":
+        instance_set = instances.random8(per_depth=args.per_depth,
+                                         seed=args.seed)
+    else:
+        instance_set = instances.SETS[args.set]()
+    instance_set = instance_set[:args.limit]
+    records = list(run(solvers, instance_set, algorithms,
+                       args.heuristics.split(","), args.repeats,
+                       args.warmup, not args.no_memory))
+    print(*summary(records), sep="\n")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"revision": revision(),
+                       "python": platform.python_version(),
+                       "set": args.set, "seed": args.seed,
+                       "repeats": args.repeats, "runs": records},
+                      f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
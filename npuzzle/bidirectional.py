@@ -0,0 +1,95 @@
+"""Двунаправленный поиск в ширину: от начального и от целевого состояния.
+
+Для решения длины d каждая сторона проходит около b^(d/2) вершин вместо
+b^d у однонаправленного поиска в ширину.
+"""
+from npuzzle import board
+
+
+class Direction:
+    """Одна сторона поиска: карта посещенных состояний и текущий слой"""
+
+    def __init__(self, root: int, size: int):
+        # состояние -> (родительское состояние, код действия), у корня None
+        self.parents: dict[int, tuple[int, int] | None] = {root: None}
+        self.layer = [(root, board.blank_index(root, size))]
+        self.depth = 0
+
+    def chain(self, state: int) -> list[tuple[int, int | None]]:
+        """Путь от state до корня стороны: пары (состояние, код действия,
+        которым оно получено из своего родителя)"""
+        chain = []
+        while state is not None:
+            link = self.parents[state]
+            chain.append((state, link[1] if link else None))
+            state = link[0] if link else None
+        return chain
+
+
+class BidirectionalSearch:
+    def __init__(self, start: int, goal: int, rows: int = board.ROWS,
+                 cols: int = board.COLS):
+        self.moves = board.move_table(rows, cols)
+        self.bits = board.cell_bits(rows * cols)
+        self.solvable = board.solvable(start, goal, rows, cols)
+        self.forward = Direction(start, rows * cols)
+        self.backward = Direction(goal, rows * cols)
+        self.count_new_states = 0  # количество полученных новых состояний
+
+    @property
+    def stored(self) -> int:
+        """Количество состояний в картах обеих сторон"""
+        return len(self.forward.parents) + len(self.backward.parents)
+
+    def run(self) -> list[tuple[int, int | None]]:
+        """Кратчайший путь от start до goal: пары (состояние, код действия)"""
+        forward, backward = self.forward, self.backward
+        (start, _), = forward.layer
+        if not self.solvable:  # обход не найдет пути, не стоит и начинать
+            raise Exception('нет решения !!!')
+        if start in backward.parents:
+            return [(start, None)]
+        while forward.layer and backward.layer:
+            # раскрывается меньший из двух слоев
+            if len(forward.layer) <= len(backward.layer):
+                meeting = self._expand_layer(forward, backward)
+            else:
+                meeting = self._expand_layer(backward, forward)
+            if meeting is not None:
+                return self._splice(meeting)
+        raise Exception('нет решения !!!')
+
+    def _expand_layer(self, side: Direction, other: Direction) -> int | None:
+        """Раскрытие всего слоя стороны side. Возвращает состояние встречи с
+        другой стороной, дающее кратчайший путь, или None"""
+        moves, parents, bits = self.moves, side.parents, self.bits
+        next_layer = []
+        meetings = []
+        for state, blank_pos in side.layer:
+            for operator, new_blank_pos in moves[blank_pos]:
+                new_state = board.move(state, blank_pos, new_blank_pos,
+                                       bits)
+                self.count_new_states += 1
+                if new_state in parents:
+                    continue
+                parents[new_state] = (state, operator)
+                if new_state in other.parents:
+                    meetings.append(new_state)
+                next_layer.append((new_state, new_blank_pos))
+        side.layer = next_layer
+        side.depth += 1
+        if not meetings:
+            return None
+        # слой раскрыт целиком, поэтому минимум по встречам оптимален
+        return min(meetings, key=lambda state: len(other.chain(state)))
+
+    def _splice(self, meeting: int) -> list[tuple[int, int | None]]:
+        """Склейка цепочек родителей обеих сторон в один путь"""
+        path = self.forward.chain(meeting)
+        path.reverse()  # от start до точки встречи
+        tail = self.backward.chain(meeting)  # от точки встречи до goal
+        # действие, которым получено состояние на обратной стороне, ведет
+        # к точке встречи; вперед по пути совершается обратное действие
+        for (_, action), (state, _) in zip(tail, tail[1:]):
+            path.append((state, board.INVERSE[action]))
+        return path
@@ -0,0 +1,146 @@
+"""Компактное представление состояния: поле упаковано в одно целое число.
+
+Клетка с индексом i = строка * cols + столбец занимает bits бит начиная с
+bits * i, пустая клетка хранится как 0. bits = 4, пока номера фишек
+помещаются в 4 бита (поля до 16 клеток), дальше — сколько нужно
+(cell_bits): 5x5 — 5 бит на клетку. Для поля 3x3 состояние помещается в
+36 бит. Функции, которым известен размер поля, выводят bits из него сами;
+tile_at и move, вызываемые на каждом ходе, принимают bits явно.
+Допустимые ходы для каждой позиции пустой клетки заранее собраны в таблицу.
+"""
+from functools import lru_cache
+
+from npuzzle import permutation
+
+ROWS, COLS = 3, 3
+SIZE = ROWS * COLS
+BITS = 4  # бит на клетку для полей до 16 клеток
+MASK = (1 << BITS) - 1
+
+OPERATORS = ("left", "up", "right", "down")  # код действия — индекс здесь
+INVERSE = (2, 3, 0, 1)  # код обратного действия: left <-> right, up <-> down
+STEPS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+
+
+def cell_bits(size: int) -> int:
+    """Бит на клетку для поля из size клеток"""
+    return max(BITS, (size - 1).bit_length())
+
+
+def pack(grid) -> int:
+    """Упаковка поля (кортежа строк) в целое число"""
+    flat = [cell for row in grid for cell in row]
+    bits = cell_bits(len(flat))
+    state = 0
+    for i, cell in enumerate(flat):
+        if cell != ' ':  # пустая клетка (' ' или 0) даёт нулевые биты
+            state |= cell << (bits * i)
+    return state
+
+
+def cells(state: int, size: int = SIZE) -> list[int]:
+    """Фишки по клеткам поля (0 — пустая клетка)"""
+    bits = cell_bits(size)
+    mask = (1 << bits) - 1
+    return [(state >> (bits * i)) & mask for i in range(size)]
+
+
+def tile_at(state: int, pos: int, bits: int = BITS) -> int:
+    return (state >> (bits * pos)) & ((1 << bits) - 1)
+
+
+def tile_positions(state: int, size: int = SIZE) -> list[int]:
+    """Индексы клеток по номерам фишек: positions[tile] = индекс клетки"""
+    positions = [0] * size
+    for i, tile in enumerate(cells(state, size)):
+        positions[tile] = i
+    return positions
+
+
+def unpack(state: int, rows: int = ROWS, cols: int = COLS, blank=' '
+           ) -> tuple[tuple[int | str]]:
+    """Обратное преобразование в кортеж строк поля"""
+    flat = [tile if tile else blank for tile in cells(state, rows * cols)]
+    return tuple(tuple(flat[i:i + cols]) for i in range(0, rows * cols, cols))
+
+
+def state_str(state: int, rows: int = ROWS, cols: int = COLS, blank=' '
+              ) -> str:
+    flat = [str(tile if tile else blank) for tile in cells(state, rows * cols)]
+    return '\n'.join(' '.join(flat[i:i + cols])
+                     for i in range(0, rows * cols, cols))
+
+
+def blank_index(state: int, size: int = SIZE) -> int:
+    """Поиск пустой клетки. Нужен только для корня: дальше индекс пустой
+    клетки передается от родителя к потомку"""
+    bits = cell_bits(size)
+    mask = (1 << bits) - 1
+    for i in range(size):
+        if not (state >> (bits * i)) & mask:
+            return i
+
+
+def rank(state: int, size: int = SIZE) -> int:
+    """Ранг перестановки клеток поля: индекс состояния от 0 до size!-1
+    (permutation.rank, развернутый по битам упакованного поля)"""
+    bits = cell_bits(size)
+    mask = (1 << bits) - 1
+    rank = used = 0
+    for i in range(size):
+        tile = state & mask
+        state >>= bits
+        smaller_used = (used & ((1 << tile) - 1)).bit_count()
+        rank = rank * (size - i) + tile - smaller_used
+        used |= 1 << tile
+    return rank
+
+
+def parity(state: int, rows: int = ROWS, cols: int = COLS) -> int:
+    """Инвариант ходов: четность числа инверсий фишек (без пустой клетки),
+    для поля четной ширины — вместе с номером строки пустой клетки"""
+    tiles = [tile - 1 for tile in cells(state, rows * cols) if tile]
+    value = permutation.inversions(tiles)
+    if cols % 2 == 0:
+        value += blank_index(state, rows * cols) // cols
+    return value % 2
+
+
+def solvable(state: int, goal: int, rows: int = ROWS, cols: int = COLS
+             ) -> bool:
+    """Достижима ли цель goal из state: ходы не меняют четность, и поля
+    одной четности достижимы друг из друга"""
+    return parity(state, rows, cols) == parity(goal, rows, cols)
+
+
+def operator_name(code: int | None) -> str | None:
+    return OPERATORS[code] if code is not None else None
+
+
+def move(state: int, blank: int, target: int, bits: int = BITS) -> int:
+    """Перемещение фишки из клетки target в пустую клетку blank"""
+    tile = (state >> (bits * target)) & ((1 << bits) - 1)
+    return state + (tile << (bits * blank)) - (tile << (bits * target))
+
+
+@lru_cache(maxsize=None)
+def move_table(rows: int = ROWS, cols: int = COLS,
+               order: tuple[str] = OPERATORS
+               ) -> tuple[tuple[tuple[int, int]]]:
+    """Таблица ходов: table[blank] — пары (код оператора, новый индекс пустой
+    клетки) для всех допустимых операторов в порядке order. Строится один раз
+    на размер поля"""
+    table = []
+    for blank in range(rows * cols):
+        x, y = divmod(blank, cols)
+        moves = []
+        for operator in order:
+            dx, dy = STEPS[operator]
+            if 0 <= x + dx < rows and 0 <= y + dy < cols:
+                moves.append((OPERATORS.index(operator),
+                              (x + dx) * cols + y + dy))
+        table.append(tuple(moves))
+    return tuple(table)
+
+
+MOVES = move_table()
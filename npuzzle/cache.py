@@ -0,0 +1,145 @@
+"""Кэш решений: ограниченный LRU по упакованной паре (начальное, целевое).
+
+Решение зависит только от того, куда должна попасть каждая фишка, а не
+от ее номера, поэтому перед поиском в кэше фишки перенумеровываются по
+цели: фишка получает номер своей клетки в цели + 1. Цель становится
+упорядоченным полем с пустой клеткой на прежнем месте, и задачи с
+разными целями, но одинаковой расстановкой относительно цели, делят одну
+запись.
+
+Кроме того, задача не меняется при симметрии доски (поворотах и
+отражениях, для квадратного поля их 8, для прямоугольного — 4): ходы
+решения переводятся той же симметрией. Ключ — наименьшая упакованная
+пара по всем симметриям. Без перенумерации складываются только
+симметрии, переводящие цель саму в себя.
+
+Решение хранится как коды действий board.OPERATORS в системе координат
+ключа. Номера фишек после перенумерации доходят до rows * cols — на
+единицу больше, чем в поле, — поэтому ключ упаковывается по
+cell_bits(rows * cols + 1) бит на клетку (для 4x4 — 5 бит, а не 4).
+
+Необязательное хранилище на диске (dbm) пополняется при каждой записи и
+читается при промахе памяти, так что после перезапуска кэш не пуст.
+Вытеснение из памяти его не затрагивает.
+"""
+import dbm
+from collections import OrderedDict
+
+from npuzzle import board
+
+
+def _pack(cells: list[int], bits: int) -> int:
+    state = 0
+    for i, tile in enumerate(cells):
+        state |= tile << (bits * i)
+    return state
+
+
+def _symmetries(rows: int, cols: int) -> list[tuple[tuple[int], tuple[int]]]:
+    """Симметрии поля, сохраняющие его размеры: пары (новый индекс каждой
+    клетки, новый код каждого действия)"""
+    maps = [lambda r, c: (r, c), lambda r, c: (rows - 1 - r, c),
+            lambda r, c: (r, cols - 1 - c),
+            lambda r, c: (rows - 1 - r, cols - 1 - c)]
+    if rows == cols:
+        maps += [lambda r, c, f=f: f(c, r) for f in maps]
+    symmetries = []
+    for f in maps:
+        cells = tuple(r * cols + c for r, c in
+                      (f(i // cols, i % cols) for i in range(rows * cols)))
+        codes = []
+        for operator in board.OPERATORS:
+            dr, dc = board.STEPS[operator]
+            (r0, c0), (r1, c1) = f(0, 0), f(dr, dc)
+            step = (r1 - r0, c1 - c0)
+            codes.append(next(code for code, name in enumerate(board.OPERATORS)
+                              if board.STEPS[name] == step))
+        symmetries.append((cells, tuple(codes)))
+    return symmetries
+
+
+class SolutionCache:
+    def __init__(self, capacity: int = 10000, path: str | None = None,
+                 relabel: bool = True):
+        """capacity — сколько решений держать в памяти, path — файл
+        хранилища на диске (None — только память), relabel — перенумерация
+        фишек по цели"""
+        self.capacity = capacity
+        self.relabel = relabel
+        self.entries: OrderedDict[str, str] = OrderedDict()
+        self.store = dbm.open(path, "c") if path else None
+        self.hits = 0
+        self.disk_hits = 0  # из них найдено только на диске
+        self.misses = 0
+        self.evictions = 0
+        self._symmetries = {}
+
+    def key(self, start: int, goal: int, rows: int = board.ROWS,
+            cols: int = board.COLS) -> tuple[str, tuple[int]]:
+        """Ключ пары полей и коды действий ключа, соответствующие кодам
+        исходной задачи"""
+        if (rows, cols) not in self._symmetries:
+            self._symmetries[rows, cols] = _symmetries(rows, cols)
+        start_cells = board.cells(start, rows * cols)
+        goal_cells = board.cells(goal, rows * cols)
+        bits = board.cell_bits(rows * cols + 1)  # номера до rows * cols
+        best = None
+        for cells, codes in self._symmetries[rows, cols]:
+            s, g = [0] * len(cells), [0] * len(cells)
+            for i, new in enumerate(cells):
+                s[new], g[new] = start_cells[i], goal_cells[i]
+            if self.relabel:
+                label = {tile: i + 1 for i, tile in enumerate(g)}
+                s = [label[tile] if tile else 0 for tile in s]
+                g = [i + 1 if tile else 0 for i, tile in enumerate(g)]
+            elif g != goal_cells:
+                continue  # цель не симметрична
+            pair = (_pack(s, bits), _pack(g, bits))
+            if best is None or pair < best[0]:
+                best = pair, codes
+        (s, g), codes = best
+        return f"{rows}x{cols}:{s}:{g}", codes
+
+    def get(self, start: int, goal: int, rows: int = board.ROWS,
+            cols: int = board.COLS) -> list[int] | None:
+        """Коды действий решения или None, если его нет в кэше"""
+        key, codes = self.key(start, goal, rows, cols)
+        moves = self.entries.get(key)
+        if moves is not None:
+            self.entries.move_to_end(key)
+        elif self.store is not None and key in self.store:
+            moves = self.store[key].decode()
+            self.disk_hits += 1
+            self._remember(key, moves)
+        if moves is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        inverse = {new: code for code, new in enumerate(codes)}
+        return [inverse[int(move)] for move in moves]
+
+    def put(self, start: int, goal: int, actions: list[int],
+            rows: int = board.ROWS, cols: int = board.COLS):
+        """Запоминание решения: коды действий от start до goal"""
+        key, codes = self.key(start, goal, rows, cols)
+        moves = "".join(str(codes[action]) for action in actions)
+        self._remember(key, moves)
+        if self.store is not None:
+            self.store[key] = moves
+
+    def _remember(self, key: str, moves: str):
+        self.entries[key] = moves
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def as_dict(self) -> dict:
+        return {"size": len(self.entries), "capacity": self.capacity,
+                "hits": self.hits, "disk_hits": self.disk_hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
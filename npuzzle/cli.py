@@ -0,0 +1,177 @@
+"""Пакетное решение из командной строки через npuzzle.search, без диалога
+скриптов лабораторных.
+
+Поля читаются из файла или stdin по одному на строку; на каждое поле в
+stdout пишется строка JSON (NDJSON) и сразу сбрасывается, так что вывод
+можно читать по мере решения:
+
+    echo "7 4 2 3 5 8 1 0 6" | python -m npuzzle.cli \\
+        --goal "1 2 3 4 0 5 6 7 8"
+    python -m npuzzle.cli boards.txt --algorithm idastar --rows 4 \\
+        --heuristic manhattan+linear_conflict --max-seconds 10
+
+Поле — номера фишек по строкам через пробел или запятую, 0 — пустая
+клетка. Строка "начальное | целевое" задает и свою цель, иначе берется
+--goal (по умолчанию фишки по порядку, пустая клетка последняя). Пустые
+строки и строки с # пропускаются. С --goal-tree N запросы к одной цели
+сначала ищутся в дереве обратного поиска от нее (npuzzle.goal_tree),
+которое растет от поля к полю, но не дальше N состояний.
+
+Запись результата: index (номер поля во входе, с 0), start, goal,
+algorithm, heuristic, status — "solved", "unsolvable", "budget" (лимит
+вершин, времени или глубины iddfs) или "invalid"; для решенных — length,
+moves (коды действий по именам board.OPERATORS); expanded, generated,
+seconds; при ошибке — error.
+"""
+import argparse
+import json
+import sys
+
+from npuzzle import board, goal_tree, heuristics, search
+
+
+def parse_board(text: str, rows: int | None = None,
+                cols: int | None = None) -> tuple[tuple[int]]:
+    """Кортеж строк поля из строки с номерами фишек"""
+    return search.grid([int(tile) for tile in text.replace(",", " ").split()],
+                       rows, cols)
+
+
+def ordered_goal(rows: int, cols: int) -> tuple[tuple[int]]:
+    """Фишки по порядку, пустая клетка в последней клетке"""
+    tiles = list(range(1, rows * cols)) + [0]
+    return tuple(tuple(tiles[r * cols:(r + 1) * cols]) for r in range(rows))
+
+
+def _idastar(start, goal, algorithm, heuristic, metrics, max_nodes=None,
+             max_seconds=None):
+    """IDA* пакета (npuzzle.idastar) с интерфейсом search.solve: бюджеты
+    вершин и времени есть, лимита глубины нет"""
+    from npuzzle.idastar import ida_star
+    rows, cols = len(start), len(start[0])
+    start, goal = board.pack(start), board.pack(goal)
+    if not board.solvable(start, goal, rows, cols):
+        raise search.NoSolution('нет решения !!!')
+    iterations = []
+    try:
+        with metrics.phase("search"):
+            return ida_star(start, goal,
+                            heuristics.heuristic(heuristic, goal, rows, cols),
+                            rows, cols, on_iteration=iterations.append,
+                            max_nodes=max_nodes, max_seconds=max_seconds)
+    finally:  # счетчики и для прерванного по бюджету поиска
+        metrics.generated = sum(it.count_new_states for it in iterations)
+        metrics.expanded = sum(it.expanded for it in iterations)
+
+
+ALGORITHMS = list(search.ALGORITHMS) + ["idastar"]
+
+
+def solve_line(index: int, line: str, args, trees=None) -> dict:
+    """Запись результата для одной строки входа. trees — деревья
+    обратного поиска goal_tree.GoalTrees, общие для всех строк"""
+    record = {"index": index, "algorithm": args.algorithm,
+              "heuristic": (args.heuristic if args.algorithm in
+                            ("astar", "greedy", "idastar") else None)}
+    try:
+        start_text, _, goal_text = line.partition("|")
+        start = parse_board(start_text, args.rows, args.cols)
+        rows, cols = len(start), len(start[0])
+        goal = (parse_board(goal_text, rows, cols) if goal_text.strip()
+                else parse_board(args.goal, rows, cols) if args.goal
+                else ordered_goal(rows, cols))
+    except ValueError as e:
+        record.update(status="invalid", error=str(e))
+        return record
+    record["start"] = [tile for row in start for tile in row]
+    record["goal"] = [tile for row in goal for tile in row]
+    try:
+        if args.algorithm == "idastar":
+            record.update(search.result(start, goal, args.algorithm,
+                                        args.heuristic, solver=_idastar,
+                                        max_nodes=args.max_nodes,
+                                        max_seconds=args.max_seconds))
+        else:
+            record.update(search.result(start, goal, args.algorithm,
+                                        args.heuristic,
+                                        solver=trees and trees.solve,
+                                        limit=args.limit,
+                                        max_nodes=args.max_nodes,
+                                        max_seconds=args.max_seconds))
+    except ValueError as e:  # эвристика не строится для такого поля
+        record.update(status="invalid", error=str(e))
+    return record
+
+
+def read_boards(file):
+    """Пары (номер поля, строка) без пустых строк и комментариев"""
+    index = 0
+    for line in file:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield index, line
+            index += 1
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m npuzzle.cli",
+        description="Решение головоломок из файла или stdin, результат — "
+                    "строка JSON на каждое поле")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="файл с полями, по умолчанию stdin")
+    parser.add_argument("--goal", help="целевое поле для строк без своей "
+                                       "цели")
+    parser.add_argument("--algorithm", default="astar", choices=ALGORITHMS)
+    parser.add_argument("--heuristic", default="manhattan",
+                        help="имя из npuzzle.heuristics.HEURISTICS")
+    parser.add_argument("--rows", type=int)
+    parser.add_argument("--cols", type=int)
+    parser.add_argument("--limit", type=int,
+                        help="лимит глубины (для iddfs — наибольший)")
+    parser.add_argument("--max-nodes", type=int,
+                        help="бюджет раскрытых вершин на поле")
+    parser.add_argument("--max-seconds", type=float,
+                        help="бюджет времени на поле")
+    parser.add_argument("--goal-tree", type=int, metavar="STATES",
+                        help="держать деревья обратного поиска от целей "
+                             "до STATES состояний (bfs, iddfs, astar)")
+    parser.add_argument("--goal-tree-eviction", default="lru",
+                        choices=goal_tree.EVICTION,
+                        help="какое дерево вытеснять при превышении")
+    args = parser.parse_args(argv)
+    if args.heuristic not in heuristics.HEURISTICS:
+        parser.error(f"неизвестная эвристика: {args.heuristic}. Доступны: "
+                     f"{', '.join(heuristics.HEURISTICS)}")
+    if args.algorithm == "idastar" and (args.limit is not None
+                                        or args.goal_tree):
+        parser.error("idastar не поддерживает --limit и --goal-tree")
+    return args
+
+
+def main(argv=None, stdout=None) -> int:
+    """Код возврата 1, если хотя бы одно поле не решено"""
+    args = parse_args(argv)
+    stdout = stdout or sys.stdout
+    failed = False
+    trees = (goal_tree.GoalTrees(args.goal_tree,
+                                 eviction=args.goal_tree_eviction)
+             if args.goal_tree else None)
+    file = (sys.stdin if args.input == "-"
+            else open(args.input, encoding="utf-8"))
+    try:
+        for index, line in read_boards(file):
+            record = solve_line(index, line, args, trees)
+            failed |= record["status"] != "solved"
+            stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+            stdout.flush()
+    except BrokenPipeError:  # потребитель закрыл канал (head и т.п.)
+        sys.stderr.close()
+    finally:
+        if file is not sys.stdin:
+            file.close()
+    return int(failed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Полная таблица расстояний до цели для малых полей (8-puzzle).
+
+Обратный обход в ширину от цели один раз записывает точное расстояние для
+каждого достижимого состояния — для 3x3 их 9!/2 = 181 440, по байту на
+состояние. Индекс состояния: позиция пустой клетки и ранг (код Лемера)
+перестановки фишек, деленный на 2. Ранги 2k и 2k+1 отличаются обменом двух
+последних фишек, и достижимо ровно одно из таких состояний, поэтому
+деление на 2 нумерует достижимый класс без пропусков.
+
+Таблица сохраняется в файл и дальше отображается в память; решение —
+спуск по таблице без поиска.
+"""
+import mmap
+import os
+from collections import deque
+from pathlib import Path
+
+from npuzzle import board, permutation
+from npuzzle.pdb import DEFAULT_DIR
+
+
+class DistanceTable:
+    """Точные расстояния до goal: table[index(state)]"""
+
+    def __init__(self, goal: int, table, rows: int = board.ROWS,
+                 cols: int = board.COLS):
+        self.goal = goal
+        self.table = table  # bytes, bytearray или mmap
+        self.rows, self.cols = rows, cols
+        self.size = rows * cols
+        self.half = _entries(self.size) // self.size  # (size-1)!/2
+        self.parity = board.parity(goal, rows, cols)
+
+    def index(self, state: int, blank: int | None = None) -> int | None:
+        """Индекс состояния в таблице или None, если оно недостижимо"""
+        if board.parity(state, self.rows, self.cols) != self.parity:
+            return None
+        if blank is None:
+            blank = board.blank_index(state, self.size)
+        return self._index(state, blank)
+
+    def _index(self, state: int, blank: int) -> int:
+        """Индекс без проверки четности (состояние заведомо достижимо)"""
+        tiles = [tile - 1 for tile in board.cells(state, self.size) if tile]
+        return blank * self.half + permutation.rank(tiles) // 2
+
+    def state(self, index: int) -> int:
+        """Состояние по индексу таблицы, обратное к index: из двух
+        перестановок с рангами 2k и 2k+1 берется достижимая"""
+        blank, half_rank = divmod(index, self.half)
+        for rank in (2 * half_rank, 2 * half_rank + 1):
+            tiles = [tile + 1 for tile in
+                     permutation.unrank(rank, self.size - 1)]
+            tiles.insert(blank, 0)
+            state = board.pack([tiles])
+            if board.parity(state, self.rows, self.cols) == self.parity:
+                return state
+        raise ValueError(f"индекс вне таблицы: {index}")
+
+    def distance(self, state: int, blank: int | None = None) -> int | None:
+        """Длина кратчайшего решения или None, если решения нет"""
+        index = self.index(state, blank)
+        return self.table[index] if index is not None else None
+
+    def solve(self, start: int) -> list[tuple[int, int | None]]:
+        """Оптимальный путь в виде пар (состояние, код действия): на каждом
+        шаге выбирается ход, уменьшающий расстояние на 1"""
+        blank = board.blank_index(start, self.size)
+        distance = self.distance(start, blank)
+        if distance is None:
+            raise Exception('нет решения !!!')
+        moves = board.move_table(self.rows, self.cols)
+        bits = board.cell_bits(self.size)
+        path = [(start, None)]
+        state = start
+        while distance:
+            for code, new_blank in moves[blank]:
+                new_state = board.move(state, blank, new_blank, bits)
+                if self.distance(new_state, new_blank) == distance - 1:
+                    break
+            state, blank, distance = new_state, new_blank, distance - 1
+            path.append((state, code))
+        return path
+
+
+def _entries(size: int) -> int:
+    """Число достижимых состояний: size!/2"""
+    return permutation.arrangements(size, size) // 2
+
+
+def build(goal: int, rows: int = board.ROWS, cols: int = board.COLS
+          ) -> bytearray:
+    """Обратный обход в ширину от goal по всему достижимому классу"""
+    size = rows * cols
+    moves = board.move_table(rows, cols)
+    bits = board.cell_bits(size)
+    table = bytearray([255]) * _entries(size)
+    distances = DistanceTable(goal, table, rows, cols)
+    blank = board.blank_index(goal, size)
+    table[distances._index(goal, blank)] = 0
+    layer = deque([(goal, blank)])
+    while layer:
+        state, blank = layer.popleft()
+        depth = table[distances._index(state, blank)] + 1
+        for _, new_blank in moves[blank]:
+            new_state = board.move(state, blank, new_blank, bits)
+            index = distances._index(new_state, new_blank)
+            if table[index] == 255:
+                table[index] = depth
+                layer.append((new_state, new_blank))
+    return table
+
+
+def load(goal: int, rows: int = board.ROWS, cols: int = board.COLS,
+         directory: Path = DEFAULT_DIR) -> DistanceTable:
+    """Таблица из файла, отображенного в память; при первом обращении
+    строится и записывается"""
+    path = directory / f"dist_{rows}x{cols}_{goal:x}.bin"
+    if not path.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+        # у каждого процесса свой временный файл: пакетные решатели могут
+        # строить таблицу одновременно
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_bytes(build(goal, rows, cols))
+        os.replace(temporary, path)
+    with open(path, "rb") as file:
+        table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return DistanceTable(goal, table, rows, cols)
@@ -0,0 +1,214 @@
+"""Дерево обратного поиска от цели, общее для запросов к одной цели.
+
+Обратный обход в ширину от цели продолжается между запросами: каждый
+запрос, которого нет в дереве, раскрывает еще step состояний каймы.
+Состояние, уже попавшее в дерево, решается без поиска — подъемом по
+ссылкам родителей до цели. Обход в ширину порождает каждое состояние
+впервые на наименьшей глубине, поэтому такой путь кратчайший. Если
+состояния в дереве нет и после роста, запрос решается обычным поиском
+(search.solve). Поле другой четности (board.solvable) отсеивается до
+обращения к дереву: иначе дерево росло бы впустую до полного обхода.
+
+Рост дерева за запрос ограничен бюджетом запроса: не больше max_nodes
+раскрытий и не дольше max_seconds; обычный поиск получает остаток
+времени. Раскрытия дерева считаются в GoalTrees.expanded, а не в
+Metrics запроса: дерево общее для запросов, и его рост не должен
+расходовать бюджет вершин поиска, который идет после него.
+
+Деревья разных целей делят общий потолок max_states. При его превышении
+целиком вытесняются другие деревья: давно не использованное ("lru") или
+самое большое ("largest"); дерево текущей цели растет не дальше потолка.
+Состояние дерева стоит около 150 байт (запись словаря родителей,
+кортеж и числа).
+
+    trees = GoalTrees(max_states=500_000)
+    path = trees.solve(start, goal)  # интерфейс search.solve
+"""
+import time
+from collections import OrderedDict, deque
+
+from npuzzle import board, search
+from npuzzle.metrics import Metrics
+
+EVICTION = ("lru", "largest")
+
+
+class GoalTree:
+    """Обратный обход в ширину от goal, продолжаемый по частям"""
+
+    def __init__(self, goal: int, rows: int = board.ROWS,
+                 cols: int = board.COLS):
+        self.goal = goal
+        self.rows, self.cols = rows, cols
+        self.moves = board.move_table(rows, cols)
+        self.bits = board.cell_bits(rows * cols)
+        # состояние -> (родитель — соседнее состояние ближе к цели, код
+        # действия, которым состояние получено из родителя), у цели None
+        self.parents: dict[int, tuple[int, int] | None] = {goal: None}
+        self.frontier = deque([(goal, board.blank_index(goal, rows * cols))])
+        self.expanded = 0
+        self.generated = 0
+
+    @property
+    def complete(self) -> bool:
+        """Обход исчерпал все состояния, достижимые из цели"""
+        return not self.frontier
+
+    def path(self, start: int) -> list[tuple[int, int | None]] | None:
+        """Кратчайший путь от start до цели: пары (состояние, код действия)
+        или None, если start еще нет в дереве"""
+        if start not in self.parents:
+            return None
+        path = [(start, None)]
+        link = self.parents[start]
+        while link is not None:
+            parent, action = link
+            # вперед по пути совершается действие, обратное action
+            path.append((parent, board.INVERSE[action]))
+            link = self.parents[parent]
+        return path
+
+    def grow(self, states: int, target: int | None = None,
+             max_expanded: int | None = None,
+             deadline: float | None = None) -> bool:
+        """Раскрытие каймы, пока в дереве меньше states состояний и не
+        найдено target, но не больше max_expanded раскрытий и не позже
+        deadline (по perf_counter, сверяется раз в 256 раскрытий).
+        Возвращает, есть ли target в дереве"""
+        parents, moves, bits = self.parents, self.moves, self.bits
+        frontier = self.frontier
+        stop = (None if max_expanded is None
+                else self.expanded + max_expanded)
+        while frontier and len(parents) < states:
+            if self.expanded == stop or (
+                    deadline is not None and not self.expanded & 255
+                    and time.perf_counter() > deadline):
+                break
+            state, blank_pos = frontier.popleft()
+            self.expanded += 1
+            found = False
+            for operator, new_blank_pos in moves[blank_pos]:
+                new_state = board.move(state, blank_pos, new_blank_pos, bits)
+                self.generated += 1
+                if new_state not in parents:
+                    parents[new_state] = (state, operator)
+                    frontier.append((new_state, new_blank_pos))
+                    found |= new_state == target
+            if found:
+                return True
+        return target in parents
+
+    def __len__(self):
+        return len(self.parents)
+
+
+class GoalTrees:
+    def __init__(self, max_states: int = 500_000, step: int = 50_000,
+                 eviction: str = "lru"):
+        """max_states — общий потолок состояний всех деревьев, step —
+        сколько состояний добавить в дерево при промахе, eviction — какое
+        дерево вытеснять при превышении потолка (см. EVICTION)"""
+        if eviction not in EVICTION:
+            raise ValueError(f"Неизвестная политика вытеснения: {eviction}. "
+                             f"Доступны: {', '.join(EVICTION)}")
+        self.max_states = max_states
+        self.step = step
+        self.eviction = eviction
+        self.trees: OrderedDict[tuple[int, int, int], GoalTree] = \
+            OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expanded = 0  # раскрытий при росте всех деревьев
+
+    @property
+    def states(self) -> int:
+        return sum(len(tree) for tree in self.trees.values())
+
+    def tree(self, goal: int, rows: int = board.ROWS,
+             cols: int = board.COLS) -> GoalTree:
+        """Дерево цели goal, при необходимости новое; становится
+        последним использованным"""
+        key = (goal, rows, cols)
+        if key not in self.trees:
+            self.trees[key] = GoalTree(goal, rows, cols)
+        self.trees.move_to_end(key)
+        return self.trees[key]
+
+    def path(self, start: int, goal: int, rows: int = board.ROWS,
+             cols: int = board.COLS, max_nodes: int | None = None,
+             deadline: float | None = None
+             ) -> list[tuple[int, int | None]] | None:
+        """Путь из дерева цели (дерево при промахе подрастает, но не
+        больше чем на max_nodes раскрытий и не позже deadline) или None.
+        Поле другой четности в дереве не появится никогда — для него
+        дерево не растет"""
+        if not board.solvable(start, goal, rows, cols):
+            self.misses += 1
+            return None
+        tree = self.tree(goal, rows, cols)
+        path = tree.path(start)
+        if path is None and not tree.complete:
+            expanded = tree.expanded
+            tree.grow(min(len(tree) + self.step, self.max_states), start,
+                      max_nodes, deadline)
+            self.expanded += tree.expanded - expanded
+            self._evict(tree)
+            path = tree.path(start)
+        if path is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return path
+
+    def _evict(self, keep: GoalTree):
+        while self.states > self.max_states and len(self.trees) > 1:
+            if self.eviction == "lru":  # keep — последнее использованное
+                key = next(iter(self.trees))
+            else:
+                key = max((key for key, tree in self.trees.items()
+                           if tree is not keep),
+                          key=lambda key: len(self.trees[key]))
+            del self.trees[key]
+            self.evictions += 1
+
+    def solve(self, start, goal, algorithm: str = "astar",
+              heuristic: str | None = "manhattan",
+              **kwargs) -> list[tuple[int, int | None]]:
+        """search.solve, сначала спрашивающий дерево цели. Дерево дает
+        кратчайший путь, поэтому оно используется только для алгоритмов
+        search.OPTIMAL"""
+        if algorithm not in search.OPTIMAL:
+            return search.solve(start, goal, algorithm, heuristic, **kwargs)
+        rows = kwargs.get("rows") or len(start)
+        cols = kwargs.get("cols") or len(start[0])
+        start_state, goal_state = board.pack(start), board.pack(goal)
+        if not board.solvable(start_state, goal_state, rows, cols):
+            self.misses += 1
+            raise search.NoSolution('нет решения !!!')
+        metrics = kwargs.setdefault("metrics", Metrics())
+        max_seconds = kwargs.get("max_seconds")
+        tree = self.tree(goal_state, rows, cols)
+        start_time = time.perf_counter()
+        with metrics.phase("goal_tree"):
+            path = self.path(
+                start_state, goal_state, rows, cols, kwargs.get("max_nodes"),
+                None if max_seconds is None else start_time + max_seconds)
+        limit = kwargs.get("limit")
+        if path is not None and (limit is None or len(path) - 1 <= limit):
+            return path
+        if path is None and tree.complete:
+            raise search.NoSolution('нет решения !!!')
+        if max_seconds is not None:  # поиску — остаток времени
+            kwargs["max_seconds"] = max_seconds - (time.perf_counter() -
+                                                   start_time)
+            if kwargs["max_seconds"] <= 0:
+                raise search.BudgetExceeded(
+                    f"превышен лимит времени: {max_seconds} с")
+        return search.solve(start, goal, algorithm, heuristic, **kwargs)
+
+    def as_dict(self) -> dict:
+        return {"trees": len(self.trees), "states": self.states,
+                "max_states": self.max_states, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions,
+                "expanded": self.expanded}
@@ -0,0 +1,240 @@
+"""Параллельный A* с распределением состояний по хешу (HDA*).
+
+Каждое состояние принадлежит одному процессу-исполнителю — по хешу
+состояния. У исполнителя свои кайма и словарь лучших g; порожденные
+потомки чужих состояний копятся в пачки и отправляются владельцу через
+его очередь. Стоимость лучшего найденного решения (incumbent) общая:
+вершины с f >= incumbent не раскрываются.
+
+Завершение. Исполнитель публикует в общем массиве наименьшее f своей
+каймы вместе с еще не отправленными потомками; in_flight — число вершин,
+отправленных, но еще не принятых в кайму получателя, sent — сколько
+отправлено всего. Поиск закончен, когда решение найдено и при неизменных
+sent и in_flight == 0 все опубликованные f не меньше incumbent: тогда
+вершин, которые могли бы дать решение короче, не осталось.
+"""
+import heapq
+import multiprocessing
+import os
+import queue
+import time
+from itertools import count
+from math import inf
+
+from npuzzle import board, heuristics
+
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+def owner(state: int, workers: int) -> int:
+    """Исполнитель, которому принадлежит состояние"""
+    return ((state * _GOLDEN) >> 40) % workers
+
+
+class _Shared:
+    """Общие для процессов счетчики. incumbent и min_f читаются на каждом
+    раскрытии, поэтому без блокировок: в ячейку min_f пишет только ее
+    исполнитель, запись incumbent защищена отдельной блокировкой"""
+
+    def __init__(self, context, workers: int):
+        self.incumbent = context.Value('d', inf, lock=False)
+        self.incumbent_lock = context.Lock()
+        self.in_flight = context.Value('q', 0)
+        self.sent = context.Value('q', 0)
+        self.min_f = context.Array('d', [0.0] * workers, lock=False)
+
+
+def _worker(me, start, goal, heuristic_name, rows, cols, shared, inboxes,
+            results, batch_size):
+    """Цикл исполнителя: прием вершин, раскрытие, отправка чужих потомков.
+    После сигнала завершения отвечает на запросы родителей для сборки пути"""
+    workers = len(inboxes)
+    heuristic = heuristics.heuristic(heuristic_name, goal, rows, cols)
+    moves = board.move_table(rows, cols)
+    bits = board.cell_bits(rows * cols)
+    inbox = inboxes[me]
+    best_g: dict[int, int] = {}
+    # состояние -> (родительское состояние, код действия), у корня None
+    parents: dict[int, tuple[int, int] | None] = {}
+    nodes = []  # куча (f, -g, счетчик, состояние, пустая клетка, h)
+    tie = count()
+    outgoing = [[] for _ in range(workers)]
+    outgoing_f = inf  # наименьшее f среди неотправленных потомков
+    count_new_states = 0
+    incumbent = inf  # копия shared.incumbent, читается раз на раскрытие
+
+    def insert(state, blank, g, h, parent, action):
+        """Цель сохраняется всегда (ее родитель нужен для сборки пути), но в
+        кайму не попадает"""
+        if g < best_g.get(state, inf) and (g + h < incumbent
+                                           or state == goal):
+            best_g[state] = g
+            parents[state] = (parent, action) if parent is not None else None
+            if state != goal:
+                heapq.heappush(nodes, (g + h, -g, next(tie), state, blank, h))
+
+    def flush():
+        nonlocal outgoing_f
+        for other, batch in enumerate(outgoing):
+            if batch:
+                with shared.in_flight.get_lock():
+                    shared.in_flight.value += 1
+                with shared.sent.get_lock():
+                    shared.sent.value += 1
+                inboxes[other].put(('nodes', batch))
+                outgoing[other] = []
+        outgoing_f = inf
+
+    def publish():
+        shared.min_f[me] = min(nodes[0][0] if nodes else inf, outgoing_f)
+
+    if owner(start, workers) == me:
+        insert(start, board.blank_index(start, rows * cols), 0,
+               heuristic(start), None, None)
+    publish()
+    while True:
+        # прием: без ожидания, если есть работа, иначе с коротким ожиданием
+        try:
+            message = (inbox.get_nowait() if nodes
+                       else inbox.get(timeout=0.005))
+        except queue.Empty:
+            message = None
+        incumbent = shared.incumbent.value
+        if message is not None:
+            kind = message[0]
+            if kind == 'nodes':
+                for node in message[1]:
+                    insert(*node)
+                publish()  # до уменьшения in_flight, см. описание модуля
+                with shared.in_flight.get_lock():
+                    shared.in_flight.value -= 1
+                continue
+            if kind == 'stop':
+                break
+            if kind == 'exit':  # поиск прерван
+                return
+        if not nodes:
+            flush()
+            publish()
+            continue
+        f, neg_g, _, state, blank, h = heapq.heappop(nodes)
+        g = -neg_g
+        if g > best_g[state] or f >= incumbent:
+            publish()
+            continue  # устаревшая или бесполезная запись
+        g += 1
+        for code, new_blank in moves[blank]:
+            new_state = board.move(state, blank, new_blank, bits)
+            count_new_states += 1
+            new_h = heuristic.update(h, state, blank, new_blank)
+            other = owner(new_state, workers)
+            if other == me:
+                insert(new_state, new_blank, g, new_h, state, code)
+            elif g + new_h < incumbent or new_state == goal:
+                outgoing[other].append((new_state, new_blank, g, new_h,
+                                        state, code))
+                if new_state == goal:
+                    flush()  # до обновления incumbent: путь должен дойти
+                else:
+                    outgoing_f = min(outgoing_f, g + new_h)
+                    if len(outgoing[other]) >= batch_size:
+                        flush()
+            if new_state == goal and g < incumbent:
+                # цель уже сохранена (или отправлена владельцу) с этим g
+                with shared.incumbent_lock:
+                    if g < shared.incumbent.value:
+                        shared.incumbent.value = g
+                incumbent = shared.incumbent.value
+        publish()
+
+    results.put(('stats', me, count_new_states, len(best_g)))
+    # сборка пути: ответы на запросы родителей
+    while True:
+        message = inbox.get()
+        if message[0] == 'parent':
+            results.put(('parent', parents.get(message[1])))
+        elif message[0] == 'exit':
+            return
+
+
+class HDAStar:
+    def __init__(self, start: int, goal: int, heuristic: str = "manhattan",
+                 rows: int = board.ROWS, cols: int = board.COLS,
+                 workers: int | None = None, batch_size: int = 64):
+        """heuristic — имя из heuristics.HEURISTICS (эвристика строится в
+        каждом процессе заново)"""
+        self.start, self.goal = start, goal
+        self.heuristic = heuristic
+        self.rows, self.cols = rows, cols
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.solvable = board.solvable(start, goal, rows, cols)
+        self.count_new_states = 0  # количество полученных новых состояний
+        self.stored = 0  # состояний в словарях всех исполнителей
+
+    def run(self) -> list[tuple[int, int | None]]:
+        """Оптимальный путь от start до goal: пары (состояние, код действия)
+        """
+        if not self.solvable:
+            raise Exception('нет решения !!!')
+        if self.start == self.goal:
+            return [(self.start, None)]
+        context = multiprocessing.get_context()
+        shared = _Shared(context, self.workers)
+        inboxes = [context.Queue() for _ in range(self.workers)]
+        results = context.Queue()
+        processes = [
+            context.Process(target=_worker, daemon=True, args=(
+                me, self.start, self.goal, self.heuristic, self.rows,
+                self.cols, shared, inboxes, results, self.batch_size))
+            for me in range(self.workers)]
+        for process in processes:
+            process.start()
+        try:
+            cost = self._wait(shared, processes)
+            for inbox in inboxes:
+                inbox.put(('stop',))
+            for _ in processes:
+                _, _, count_new_states, stored = results.get()
+                self.count_new_states += count_new_states
+                self.stored += stored
+            if cost == inf:
+                raise Exception('нет решения !!!')
+            return self._trace(inboxes, results)
+        finally:
+            for inbox in inboxes:
+                inbox.put(('exit',))
+            for process in processes:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+
+    @staticmethod
+    def _wait(shared, processes) -> float:
+        """Ожидание условия завершения, возвращает стоимость решения"""
+        while True:
+            time.sleep(0.001)
+            if not all(process.is_alive() for process in processes):
+                raise RuntimeError("исполнитель HDA* завершился с ошибкой")
+            sent = shared.sent.value
+            if shared.in_flight.value:
+                continue
+            incumbent = shared.incumbent.value
+            lowest = min(shared.min_f[:])
+            if (shared.in_flight.value == 0 and shared.sent.value == sent
+                    and lowest >= incumbent):
+                return incumbent
+
+    def _trace(self, inboxes, results) -> list[tuple[int, int | None]]:
+        """Путь от цели к корню по родителям, хранящимся у владельцев"""
+        path = []
+        state = self.goal
+        while True:
+            inboxes[owner(state, len(inboxes))].put(('parent', state))
+            link = results.get()[1]
+            path.append((state, link[1] if link else None))
+            if link is None:
+                break
+            state = link[0]
+        path.reverse()
+        return path
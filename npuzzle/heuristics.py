@@ -0,0 +1,275 @@
+"""Эвристики для упакованных состояний (см. npuzzle.board).
+
+Все эвристики допустимы, строятся для произвольной цели и
+пересчитываются после хода: update(value, state, blank, target) дает
+значение для board.move(state, blank, target) по значению value для state.
+Выбор по имени — через реестр HEURISTICS и функцию heuristic().
+
+Размер поля произвольный, кроме walking distance: ее таблица — обход всей
+абстракции, и для стороны поля больше MAX_WALKING_LINES он не помещается
+ни во время, ни в память (для 5x5 — миллионы состояний и гигабайты), так
+что такие поля отклоняются с ValueError. Базы шаблонов строятся заранее
+(npuzzle.pdb).
+"""
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+from itertools import permutations
+
+from npuzzle import board
+
+MAX_WALKING_LINES = 4  # 4x4: таблица из 24 964 состояний абстракции
+
+
+class TableHeuristic:
+    """Сумма по фишкам table[tile][pos] — вкладов фишки tile, стоящей в
+    клетке pos. После хода меняется вклад только сдвинутой фишки, поэтому
+    пересчет занимает O(1)"""
+
+    def __init__(self, table: tuple[tuple[int]]):
+        self.table = table
+        self.size = len(table)
+        self.bits = board.cell_bits(self.size)
+
+    def __call__(self, state: int) -> int:
+        table = self.table
+        return sum(table[tile][pos]
+                   for pos, tile in enumerate(board.cells(state, self.size)))
+
+    def update(self, value: int, state: int, blank: int, target: int) -> int:
+        table = self.table
+        tile = board.tile_at(state, target, self.bits)
+        return value + table[tile][blank] - table[tile][target]
+
+
+@lru_cache(maxsize=None)
+def misplaced_tiles(goal: int, rows: int = board.ROWS,
+                    cols: int = board.COLS) -> TableHeuristic:
+    """Количество не на своих местах цифр"""
+    goal_cells = board.cells(goal, rows * cols)
+    return TableHeuristic(((0,) * (rows * cols),) + tuple(
+        tuple(int(goal_tile != tile) for goal_tile in goal_cells)
+        for tile in range(1, rows * cols)
+    ))
+
+
+@lru_cache(maxsize=None)
+def manhattan(goal: int, rows: int = board.ROWS,
+              cols: int = board.COLS) -> TableHeuristic:
+    """Сумма манхэттенских расстояний"""
+    b = board.tile_positions(goal, rows * cols)
+    return TableHeuristic(((0,) * (rows * cols),) + tuple(
+        tuple(abs(pos // cols - b[tile] // cols) +
+              abs(pos % cols - b[tile] % cols)
+              for pos in range(rows * cols))
+        for tile in range(1, rows * cols)
+    ))
+
+
+def _longest_increasing(sequence: list[int]) -> int:
+    """Длина наибольшей возрастающей подпоследовательности"""
+    tails = []
+    for value in sequence:
+        i = bisect_left(tails, value)
+        tails[i:i + 1] = [value]
+    return len(tails)
+
+
+class LinearConflict:
+    """Манхэттенское расстояние плюс линейные конфликты.
+
+    Фишки, стоящие в своей целевой строке (столбце) в обратном целевому
+    порядке, не могут разойтись без выхода из линии. Минимальное число фишек,
+    которые придется вывести из линии, — это их количество минус длина
+    наибольшей возрастающей подпоследовательности целевых позиций; каждая
+    такая фишка добавляет два хода к манхэттенскому расстоянию.
+
+    Число конфликтов зависит только от последовательности целевых позиций
+    фишек, стоящих в своей линии, поэтому оно заранее считается для всех
+    таких последовательностей (для 4x4 их 65) — таблица общая для всех
+    линий и не растет во время поиска"""
+
+    def __init__(self, goal: int, rows: int, cols: int):
+        size = rows * cols
+        self.manhattan = manhattan(goal, rows, cols)
+        self.cols = cols
+        self.bits = board.cell_bits(size)
+        goal_pos = board.tile_positions(goal, size)
+        # линии: (клетки линии, номер целевой линии фишки, позиция в линии)
+        self.rows = [(tuple(range(r * cols, (r + 1) * cols)),
+                      [pos // cols for pos in goal_pos],
+                      [pos % cols for pos in goal_pos], r)
+                     for r in range(rows)]
+        self.columns = [(tuple(range(c, size, cols)),
+                         [pos % cols for pos in goal_pos],
+                         [pos // cols for pos in goal_pos], c)
+                        for c in range(cols)]
+        # последовательность целевых позиций в линии -> добавка к оценке
+        self.conflicts: dict[tuple[int], int] = {
+            places: 2 * (len(places) - _longest_increasing(places))
+            for length in range(max(rows, cols) + 1)
+            for places in permutations(range(max(rows, cols)), length)}
+
+    def _line(self, state: int, line) -> int:
+        cells, goal_line, goal_place, index = line
+        bits = self.bits
+        places = []
+        for pos in cells:
+            tile = board.tile_at(state, pos, bits)
+            if tile and goal_line[tile] == index:
+                places.append(goal_place[tile])
+        return self.conflicts[tuple(places)]
+
+    def __call__(self, state: int) -> int:
+        return self.manhattan(state) + sum(
+            self._line(state, line) for line in self.rows + self.columns)
+
+    def update(self, value: int, state: int, blank: int, target: int) -> int:
+        cols = self.cols
+        if blank // cols == target // cols:  # ход по строке: меняются столбцы
+            lines = (self.columns[blank % cols], self.columns[target % cols])
+        else:  # ход по столбцу: меняются строки
+            lines = (self.rows[blank // cols], self.rows[target // cols])
+        new_state = board.move(state, blank, target, self.bits)
+        return (self.manhattan.update(value, state, blank, target) +
+                sum(self._line(new_state, line) - self._line(state, line)
+                    for line in lines))
+
+
+@lru_cache(maxsize=None)
+def linear_conflict(goal: int, rows: int = board.ROWS,
+                    cols: int = board.COLS) -> LinearConflict:
+    return LinearConflict(goal, rows, cols)
+
+
+class _WalkingTable:
+    """Таблица walking distance по одному направлению.
+
+    Состояние абстракции — матрица counts[line][goal_line] (сколько фишек
+    стоит в линии line при целевой линии goal_line) и линия пустой клетки.
+    Ход поперек линий переносит одну фишку из соседней линии в линию пустой
+    клетки. Расстояния до цели находятся обходом в ширину от абстракции цели
+    """
+
+    def __init__(self, lines: int, line_of: list[int], goal_line: list[int],
+                 goal: int):
+        self.lines = lines
+        self.line_of = line_of  # линия клетки
+        self.goal_line = goal_line  # целевая линия фишки
+        self.distance = self._build(self.key(goal))
+
+    def key(self, state: int) -> tuple[tuple[int], int]:
+        counts = [0] * (self.lines * self.lines)
+        blank_line = 0
+        for pos, tile in enumerate(board.cells(state, len(self.line_of))):
+            if tile:
+                counts[self.line_of[pos] * self.lines +
+                       self.goal_line[tile]] += 1
+            else:
+                blank_line = self.line_of[pos]
+        return tuple(counts), blank_line
+
+    def _build(self, root) -> dict:
+        n = self.lines
+        distance = {root: 0}
+        queue = deque([root])
+        while queue:
+            key = queue.popleft()
+            counts, blank_line = key
+            for line in (blank_line - 1, blank_line + 1):
+                if not 0 <= line < n:
+                    continue
+                for goal_line in range(n):
+                    if not counts[line * n + goal_line]:
+                        continue
+                    new_counts = list(counts)
+                    new_counts[line * n + goal_line] -= 1
+                    new_counts[blank_line * n + goal_line] += 1
+                    new_key = (tuple(new_counts), line)
+                    if new_key not in distance:
+                        distance[new_key] = distance[key] + 1
+                        queue.append(new_key)
+        return distance
+
+    def __call__(self, state: int) -> int:
+        return self.distance.get(self.key(state), 0)
+
+
+class WalkingDistance:
+    """Walking distance: сумма точных расстояний в двух абстракциях — по
+    строкам (учитываются только вертикальные ходы) и по столбцам (только
+    горизонтальные). Каждый ход меняет ровно одну из них не больше чем на 1,
+    поэтому сумма допустима и не меньше манхэттенского расстояния"""
+
+    def __init__(self, goal: int, rows: int, cols: int):
+        if max(rows, cols) > MAX_WALKING_LINES:
+            raise ValueError(f"walking_distance строится для полей со "
+                             f"стороной не больше {MAX_WALKING_LINES}, "
+                             f"а не {rows}x{cols}")
+        size = rows * cols
+        goal_pos = board.tile_positions(goal, size)
+        self.cols = cols
+        self.bits = board.cell_bits(size)
+        self.vertical = _WalkingTable(
+            rows, [pos // cols for pos in range(size)],
+            [pos // cols for pos in goal_pos], goal)
+        self.horizontal = _WalkingTable(
+            cols, [pos % cols for pos in range(size)],
+            [pos % cols for pos in goal_pos], goal)
+
+    def __call__(self, state: int) -> int:
+        return self.vertical(state) + self.horizontal(state)
+
+    def update(self, value: int, state: int, blank: int, target: int) -> int:
+        cols = self.cols
+        table = (self.horizontal if blank // cols == target // cols
+                 else self.vertical)
+        return (value - table(state) +
+                table(board.move(state, blank, target, self.bits)))
+
+
+@lru_cache(maxsize=None)
+def walking_distance(goal: int, rows: int = board.ROWS,
+                     cols: int = board.COLS) -> WalkingDistance:
+    return WalkingDistance(goal, rows, cols)
+
+
+@lru_cache(maxsize=None)
+def pattern_database(goal: int, rows: int = board.ROWS,
+                     cols: int = board.COLS):
+    """Аддитивные базы шаблонов. Строятся заранее командой
+    python -m npuzzle.pdb build, здесь только отображаются в память"""
+    from npuzzle import pdb
+    return pdb.load(goal, rows, cols)
+
+
+HEURISTICS = {
+    "misplaced": misplaced_tiles,
+    "manhattan": manhattan,
+    "manhattan+linear_conflict": linear_conflict,
+    "walking_distance": walking_distance,
+    "pdb": pattern_database,
+}
+
+
+def heuristic(name: str, goal: int, rows: int = board.ROWS,
+              cols: int = board.COLS):
+    """Эвристика из реестра HEURISTICS, построенная для цели goal"""
+    try:
+        factory = HEURISTICS[name]
+    except KeyError:
+        raise ValueError(f"Неизвестная эвристика: {name}. Доступны: "
+                         f"{', '.join(HEURISTICS)}") from None
+    return factory(goal, rows, cols)
+
+
+def h1(state: int, goal: int, rows: int = board.ROWS,
+       cols: int = board.COLS) -> int:
+    """Количество не на своих местах цифр"""
+    return misplaced_tiles(goal, rows, cols)(state)
+
+
+def h2(state: int, goal: int, rows: int = board.ROWS,
+       cols: int = board.COLS) -> int:
+    """Сумма манхэттенских расстояний"""
+    return manhattan(goal, rows, cols)(state)
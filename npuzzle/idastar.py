@@ -0,0 +1,126 @@
+"""IDA*: поиск в глубину с итеративным углублением по порогу f = g + h.
+
+В памяти хранится только текущий путь (явный стек), поэтому поиск подходит
+для полей, на которых кайма A* не помещается в память (например, 4x4).
+"""
+import time
+from math import inf
+
+from npuzzle import board
+from npuzzle.search import BudgetExceeded
+
+
+class Iteration:
+    """Счетчики одной итерации IDA*"""
+
+    def __init__(self, threshold):
+        self.threshold = threshold  # порог f для этой итерации
+        self.count_new_states = 0  # количество полученных новых состояний
+        self.expanded = 0  # раскрытых вершин
+        self.max_path = 0  # наибольшая длина хранимого пути
+        self.next_threshold = inf  # минимальное f, превысившее порог
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return (f"Порог f = {self.threshold}\n"
+                f"Время выполнения: {self.count_new_states}\n"
+                f"Использование памяти: {self.max_path}\n"
+                f"Секунд: {self.seconds:.3f}")
+
+
+def ida_star(start: int, goal: int, heuristic, rows: int = board.ROWS,
+             cols: int = board.COLS, on_iteration=None,
+             max_nodes: int | None = None, max_seconds: float | None = None
+             ) -> list[tuple[int, int | None]]:
+    """Оптимальный путь от start до goal в виде пар (состояние, код действия).
+
+    heuristic — допустимая эвристика с пересчетом после хода (см.
+    heuristics.TableHeuristic). on_iteration(Iteration) вызывается после
+    каждой итерации, в том числе прерванной. max_nodes — бюджет раскрытых
+    вершин на все итерации, max_seconds — бюджет времени; при превышении
+    бросается search.BudgetExceeded, как в search.Problem."""
+    if not board.solvable(start, goal, rows, cols):
+        raise Exception('нет решения !!!')
+    moves = board.move_table(rows, cols)
+    blank = board.blank_index(start, rows * cols)
+    bits = board.cell_bits(rows * cols)
+    threshold = heuristic(start)
+    deadline = (None if max_seconds is None
+                else time.perf_counter() + max_seconds)
+    expanded = 0  # раскрыто в прошлых итерациях
+    while True:
+        iteration = Iteration(threshold)
+        start_time = time.perf_counter()
+        try:
+            path = _bounded_dfs(
+                start, blank, goal, heuristic, moves, bits, iteration,
+                None if max_nodes is None else max_nodes - expanded,
+                deadline)
+        except BudgetExceeded:
+            if max_nodes is not None and (
+                    expanded + iteration.expanded >= max_nodes):
+                raise BudgetExceeded(
+                    f"превышен лимит вершин: {max_nodes}") from None
+            raise BudgetExceeded(
+                f"превышен лимит времени: {max_seconds} с") from None
+        finally:
+            iteration.seconds = time.perf_counter() - start_time
+            if on_iteration:
+                on_iteration(iteration)
+        expanded += iteration.expanded
+        if path is not None:
+            return path
+        if iteration.next_threshold == inf:
+            raise Exception('нет решения !!!')
+        threshold = iteration.next_threshold
+
+
+def _bounded_dfs(start, blank, goal, heuristic, moves, bits, iteration,
+                 max_nodes=None, deadline=None):
+    """Один проход поиска в глубину с отсечением по порогу f. max_nodes —
+    сколько вершин еще можно раскрыть, deadline — срок по perf_counter
+    (сверяется раз в 256 раскрытий)"""
+    threshold = iteration.threshold
+    if start == goal:
+        return [(start, None)]
+    states, blanks, actions = [start], [blank], [None]
+    hs = [heuristic(start)]  # значения эвристики вдоль пути
+    on_path = {start}
+    stack = [iter(moves[blank])]
+    iteration.expanded += 1
+    while stack:
+        step = next(stack[-1], None)
+        if step is None:  # все ходы из вершины перебраны — возврат
+            stack.pop()
+            on_path.discard(states.pop())
+            blanks.pop()
+            actions.pop()
+            hs.pop()
+            continue
+        code, new_blank = step
+        if len(blanks) > 1 and new_blank == blanks[-2]:
+            continue  # ход назад к родителю
+        state = board.move(states[-1], blanks[-1], new_blank, bits)
+        iteration.count_new_states += 1
+        if state in on_path:
+            continue
+        h = heuristic.update(hs[-1], states[-1], blanks[-1], new_blank)
+        f = len(states) + h
+        if f > threshold:
+            iteration.next_threshold = min(iteration.next_threshold, f)
+            continue
+        states.append(state)
+        blanks.append(new_blank)
+        actions.append(code)
+        hs.append(h)
+        iteration.max_path = max(iteration.max_path, len(states))
+        if state == goal:
+            return list(zip(states, actions))
+        if (max_nodes is not None and iteration.expanded >= max_nodes
+                or deadline is not None and not iteration.expanded & 255
+                and time.perf_counter() > deadline):
+            raise BudgetExceeded  # сообщение — в ida_star
+        on_path.add(state)
+        stack.append(iter(moves[new_blank]))
+        iteration.expanded += 1
+    return None
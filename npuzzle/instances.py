@@ -0,0 +1,74 @@
+"""Наборы задач для сравнения алгоритмов.
+
+- random8 — случайные решаемые 8-puzzle, сгруппированные по оптимальной
+  длине. Длины берутся из полной таблицы расстояний (npuzzle.distance),
+  набор воспроизводим по seed.
+- korf100 — 100 задач 15-puzzle из статьи Корфа (1985), файл
+  data/korf100.txt вместе с оптимальными длинами.
+"""
+import random
+from pathlib import Path
+
+from npuzzle import board, distance
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+GOAL_8 = board.pack(((1, 2, 3), (4, ' ', 5), (6, 7, 8)))  # как в лабах
+GOAL_15 = board.pack([range(16)])  # цель Корфа: пустая клетка в углу
+
+
+class Instance:
+    """Задача набора: упакованные начальное и целевое поля"""
+
+    def __init__(self, name: str, start: int, goal: int,
+                 rows: int = board.ROWS, cols: int = board.COLS,
+                 optimal: int | None = None):
+        self.name = name
+        self.start, self.goal = start, goal
+        self.rows, self.cols = rows, cols
+        self.optimal = optimal  # длина оптимального решения, если известна
+
+    def __repr__(self):
+        return (f"{self.name} ({self.rows}x{self.cols}, "
+                f"оптимум: {self.optimal})\n"
+                f"{board.state_str(self.start, self.rows, self.cols)}")
+
+
+def random8(depths=range(4, 32, 4), per_depth: int = 10, seed: int = 0,
+            goal: int = GOAL_8) -> list[Instance]:
+    """per_depth задач на каждую оптимальную длину из depths, выбранных
+    равновероятно среди всех полей этой глубины по таблице расстояний.
+    Глубин, где полей меньше per_depth, в наборе столько, сколько есть"""
+    table = distance.load(goal)
+    by_depth: dict[int, list[int]] = {depth: [] for depth in depths}
+    for index, depth in enumerate(table.table[:]):  # mmap -> bytes
+        if depth in by_depth:
+            by_depth[depth].append(index)
+    rng = random.Random(seed)
+    instances = []
+    for depth, indices in by_depth.items():
+        chosen = rng.sample(indices, min(per_depth, len(indices)))
+        instances += [Instance(f"random8-d{depth}-{i}", table.state(index),
+                               goal, optimal=depth)
+                      for i, index in enumerate(chosen)]
+    return instances
+
+
+def korf100(path: Path = DATA_DIR / "korf100.txt") -> list[Instance]:
+    """Задачи Корфа в порядке статьи, имена korf-1 ... korf-100"""
+    instances = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        *tiles, optimal = map(int, line.split())
+        instances.append(Instance(f"korf-{len(instances) + 1}",
+                                  board.pack([tiles]), GOAL_15, 4, 4,
+                                  optimal))
+    return instances
+
+
+# имя набора -> функция без обязательных аргументов
+SETS = {
+    "random8": random8,
+    "korf100": korf100,
+}
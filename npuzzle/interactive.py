@@ -0,0 +1,74 @@
+"""Диалог скриптов лабораторных: выбор режима, алгоритма и вывод решения.
+
+Сам поиск — в npuzzle.search, скрипты лабораторных только спрашивают
+параметры и печатают результат.
+"""
+from npuzzle import board
+
+MODES = {"0": "silent", "1": "fast", "2": "step"}
+
+
+def ask_choice(prompt: str, choices) -> str:
+    """Повторяет вопрос, пока ответ не окажется среди choices"""
+    while True:
+        choice = input(prompt)
+        if choice in choices:
+            return choice
+        print("Некорректный выбор. Попробуйте снова.")
+
+
+def ask_mode() -> str:
+    """Режим трассировки (npuzzle.trace) по выбору пользователя"""
+    return MODES[ask_choice("Выберите опцию работы программы:\n"
+                            "0) Вывести только результат\n"
+                            "1) Вывести всё сразу\n"
+                            "2) Выводить каждый шаг после нажатия Enter\n"
+                            "Ваш выбор: ", MODES)]
+
+
+def found(count_new_states: int, stored: int, *details: str):
+    """Итог поиска: число полученных состояний, число хранимых вершин и
+    дополнительные строки details"""
+    print("Решение найдено! Целевое состояние достигнуто.",
+          f"Время выполнения: {count_new_states}",
+          f"Использование памяти: {stored}", *details, sep='\n')
+
+
+def interactive_print(steps):
+    choice = input("Выберите опцию вывода:\n1) Вывести все сразу\n2) "
+                   "Выводить каждый шаг после нажатия Enter\nВаш выбор: ")
+    print("\nРешение:")
+    if choice == "1":
+        for step in steps:
+            print(step)
+            print("-" * 40)
+    elif choice == "2":
+        for step in steps:
+            input("Нажмите Enter для вывода следующего шага...")
+            print(step)
+            print("-" * 40)
+    else:
+        print("Некорректный выбор. Выводим все сразу.")
+        for step in steps:
+            print(step)
+            print("-" * 40)
+
+    print("Вывод завершен. Программа будет закрыта.")
+
+
+def print_solution(node):
+    """Путь от корня до node (цепочка Node по ссылкам parent)"""
+    path = []
+    while node:
+        path.append(node)
+        node = node.parent
+    path.reverse()
+    interactive_print(path)
+
+
+def print_path(path, rows: int, cols: int):
+    """Путь в виде пар (состояние, код действия)"""
+    interactive_print([f"Action: {board.operator_name(action)}, "
+                       f"Depth: {depth}, "
+                       f"State:\n{board.state_str(state, rows, cols)}"
+                       for depth, (state, action) in enumerate(path)])
@@ -0,0 +1,150 @@
+"""Метрики поиска: счетчики вершин, пики каймы и посещенных, время
+эвристики и фаз.
+
+Счетчики — простые атрибуты, поиск увеличивает их сам. Время фаз (wall и
+CPU) измеряется контекстным менеджером phase, вызовы эвристики считает
+обертка TimedHeuristic. Время замеряется у каждого sample-го вызова и
+пересчитывается на все: perf_counter на каждом вызове удваивал бы цену
+дешевой эвристики (пересчет h после хода — около 250 нс). Итог
+выгружается в JSON (as_dict, dump), чтобы сравнивать варианты алгоритмов
+между запусками. tracemalloc и json импортируются только при
+использовании: модуль входит в npuzzle.search, импорт которого должен
+быть дешевым.
+"""
+import time
+from contextlib import contextmanager
+
+
+class Metrics:
+    def __init__(self, memory: bool = False, sample: int = 64):
+        """memory=True включает tracemalloc на время фаз — пиковая память
+        становится известна, но поиск замедляется в несколько раз.
+        sample — замеряется каждый sample-й вызов эвристики (1 — все)"""
+        self.generated = 0  # количество полученных новых состояний
+        self.expanded = 0  # раскрытых вершин
+        self.duplicates = 0  # потомков, отброшенных как уже посещенные
+        self.peak_frontier = 0  # наибольший размер каймы
+        self.peak_visited = 0  # наибольшее число посещенных состояний
+        self.heuristic_calls = 0
+        self.sample = sample
+        self.sampled_calls = 0  # вызовов эвристики с замером времени
+        self.sampled_seconds = 0.0
+        self.depths: dict[int, int] = {}  # глубина -> раскрыто вершин
+        # фаза -> {"wall": секунды, "cpu": секунды}
+        self.phases: dict[str, dict[str, float]] = {}
+        self.memory = memory
+        self.peak_memory: int | None = None  # байт, только при memory
+
+    def expand(self, depth: int):
+        """Учет раскрытия вершины на глубине depth"""
+        self.expanded += 1
+        self.depths[depth] = self.depths.get(depth, 0) + 1
+
+    def observe(self, frontier: int, visited: int):
+        """Учет размеров каймы и множества посещенных после раскрытия"""
+        if frontier > self.peak_frontier:
+            self.peak_frontier = frontier
+        if visited > self.peak_visited:
+            self.peak_visited = visited
+
+    @contextmanager
+    def phase(self, name: str):
+        """Время блока добавляется к фазе name; повторные входы
+        суммируются"""
+        if self.memory:
+            import tracemalloc
+        tracing = self.memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield self
+        finally:
+            totals = self.phases.setdefault(name, {"wall": 0.0, "cpu": 0.0})
+            totals["wall"] += time.perf_counter() - wall
+            totals["cpu"] += time.process_time() - cpu
+            if self.memory and tracemalloc.is_tracing():
+                peak = tracemalloc.get_traced_memory()[1]
+                self.peak_memory = max(self.peak_memory or 0, peak)
+            if tracing:
+                tracemalloc.stop()
+
+    @property
+    def heuristic_seconds(self) -> float:
+        """Оценка общего времени эвристики по замеренным вызовам"""
+        if not self.sampled_calls:
+            return 0.0
+        return self.sampled_seconds * self.heuristic_calls / self.sampled_calls
+
+    @property
+    def expansions_per_second(self) -> float | None:
+        wall = self.phases.get("search", {}).get("wall")
+        return self.expanded / wall if wall else None
+
+    def as_dict(self) -> dict:
+        return {
+            "generated": self.generated,
+            "expanded": self.expanded,
+            "duplicates": self.duplicates,
+            "peak_frontier": self.peak_frontier,
+            "peak_visited": self.peak_visited,
+            "heuristic_calls": self.heuristic_calls,
+            "heuristic_seconds": self.heuristic_seconds,
+            "expansions_per_second": self.expansions_per_second,
+            "depths": {str(depth): count
+                       for depth, count in sorted(self.depths.items())},
+            "phases": self.phases,
+            "peak_memory": self.peak_memory,
+        }
+
+    def dump(self, file, **extra):
+        """Запись метрик в JSON: file — путь или открытый поток. extra —
+        дополнительные поля (алгоритм, эвристика, длина решения...)"""
+        import json
+        data = dict(extra, **self.as_dict())
+        if isinstance(file, str):
+            with open(file, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        else:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+
+    def __repr__(self):
+        rate = self.expansions_per_second
+        return (f"Порождено: {self.generated}, раскрыто: {self.expanded}, "
+                f"повторов: {self.duplicates}, "
+                f"пик каймы: {self.peak_frontier}, "
+                f"пик посещенных: {self.peak_visited}, "
+                f"вызовов эвристики: {self.heuristic_calls}, "
+                f"раскрытий в секунду: "
+                f"{f'{rate:.0f}' if rate is not None else '-'}")
+
+
+class TimedHeuristic:
+    """Эвристика с подсчетом вызовов и их времени в Metrics. Интерфейс
+    исходной: h(state) и update(value, state, blank, target)"""
+
+    def __init__(self, heuristic, metrics: Metrics):
+        self.heuristic = heuristic
+        self.metrics = metrics
+
+    def __call__(self, state: int) -> int:
+        metrics = self.metrics
+        metrics.heuristic_calls += 1
+        if metrics.heuristic_calls % metrics.sample:
+            return self.heuristic(state)
+        start = time.perf_counter()
+        value = self.heuristic(state)
+        metrics.sampled_seconds += time.perf_counter() - start
+        metrics.sampled_calls += 1
+        return value
+
+    def update(self, value: int, state: int, blank: int, target: int) -> int:
+        metrics = self.metrics
+        metrics.heuristic_calls += 1
+        if metrics.heuristic_calls % metrics.sample:
+            return self.heuristic.update(value, state, blank, target)
+        start = time.perf_counter()
+        value = self.heuristic.update(value, state, blank, target)
+        metrics.sampled_seconds += time.perf_counter() - start
+        metrics.sampled_calls += 1
+        return value
@@ -0,0 +1,312 @@
+"""Аддитивные базы данных шаблонов (disjoint pattern databases).
+
+Фишки делятся на непересекающиеся шаблоны. Для каждого шаблона обратным
+обходом от цели считается, сколько ходов фишками шаблона нужно, чтобы
+расставить их по местам (ходы пустой клетки по чужим клеткам бесплатны).
+Так как шаблоны не пересекаются, сумма по ним — допустимая эвристика.
+
+Но не монотонная (consistent): значение базы — минимум по всем
+положениям пустой клетки, поэтому за один ход оно может упасть больше
+чем на 1. A* с такой эвристикой может найти состояние короче уже после
+его раскрытия; AStar (лучшие g в best_g) и search.Problem.expand (глубины
+в visited) тогда раскрывают его повторно, и решение остается
+оптимальным. Поиск, который не пересматривает закрытые состояния, с ней
+оптимальность теряет.
+
+База хранится как bytes: значение для расстановки фишек шаблона лежит по
+индексу — рангу размещения их позиций (совершенный хеш, см.
+permutation.rank_partial). Базы строятся отдельной командой, которую
+можно прервать и продолжить:
+
+    python -m npuzzle.pdb build --size 4x4 --partition 5-5-5
+
+после чего решатели отображают файлы в память (mmap) без пересчета.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+from array import array
+from pathlib import Path
+
+from npuzzle import board
+from npuzzle.permutation import arrangements, rank_partial
+
+UNKNOWN = 255  # расстояние еще не найдено
+DEFAULT_DIR = Path(os.environ.get("NPUZZLE_PDB_DIR",
+                                  Path.home() / ".cache" / "npuzzle"))
+DEFAULT_PARTITIONS = {
+    (3, 3): (4, 4),
+    (4, 4): (5, 5, 5),
+}
+
+
+def partition_tiles(partition, tiles) -> tuple[tuple[int]]:
+    """Разбиение фишек tiles на шаблоны по размерам, например (5, 5, 5)"""
+    if sum(partition) != len(tiles):
+        raise ValueError(f"Разбиение {partition} не покрывает "
+                         f"{len(tiles)} фишек")
+    patterns, start = [], 0
+    for k in partition:
+        patterns.append(tuple(tiles[start:start + k]))
+        start += k
+    return tuple(patterns)
+
+
+def default_patterns(goal: int, rows: int, cols: int) -> tuple[tuple[int]]:
+    try:
+        partition = DEFAULT_PARTITIONS[rows, cols]
+    except KeyError:
+        raise ValueError(f"Нет разбиения по умолчанию для поля "
+                         f"{rows}x{cols}") from None
+    return partition_tiles(partition, list(range(1, rows * cols)))
+
+
+def _name(goal: int, rows: int, cols: int, tiles) -> str:
+    return (f"pdb_{rows}x{cols}_{goal:x}_"
+            f"{'-'.join(str(tile) for tile in tiles)}")
+
+
+class PatternDatabase:
+    """База одного шаблона: table[ранг позиций фишек шаблона]"""
+
+    def __init__(self, tiles: tuple[int], size: int, table):
+        self.tiles = tiles
+        self.size = size
+        self.table = table  # bytes, bytearray или mmap
+
+    def __call__(self, positions: list[int]) -> int:
+        """Значение по позициям фишек (positions[tile] — клетка фишки)"""
+        return self.table[rank_partial(
+            [positions[tile] for tile in self.tiles], self.size)]
+
+
+class AdditivePDB:
+    """Сумма значений баз непересекающихся шаблонов. Допустима, но не
+    монотонна (см. описание модуля)"""
+
+    def __init__(self, databases: list[PatternDatabase], size: int):
+        self.databases = databases
+        self.size = size
+        self.bits = board.cell_bits(size)
+        self.owner = [None] * size  # база, содержащая фишку
+        for database in databases:
+            for tile in database.tiles:
+                self.owner[tile] = database
+
+    def __call__(self, state: int) -> int:
+        positions = board.tile_positions(state, self.size)
+        return sum(database(positions) for database in self.databases)
+
+    def update(self, value: int, state: int, blank: int, target: int) -> int:
+        """Ход меняет позицию одной фишки, поэтому пересчитывается только
+        база ее шаблона: два ранга вместо суммы по всем базам. Позиции
+        фишек шаблона все равно извлекаются из состояния проходом по всем
+        клеткам (O(n)): упакованное состояние хранит фишку клетки, а не
+        клетку фишки"""
+        tile = board.tile_at(state, target, self.bits)
+        database = self.owner[tile]
+        if database is None:
+            return value
+        positions = board.tile_positions(state, self.size)
+        old = database(positions)
+        positions[tile] = blank
+        return value - old + database(positions)
+
+
+def _paths(directory: Path, name: str) -> dict[str, Path]:
+    return {part: directory / f"{name}.{part}"
+            for part in ("pdb", "json", "part", "part.tmp")}
+
+
+def build(goal: int, rows: int, cols: int, tiles: tuple[int],
+          directory: Path = DEFAULT_DIR, checkpoint_seconds: float = 60,
+          log=print) -> Path:
+    """Построение базы шаблона tiles обратным обходом (0-1 BFS) от цели.
+
+    Состояние абстракции — позиции фишек шаблона и пустой клетки. Ход
+    фишкой шаблона стоит 1, ход пустой клетки в чужую клетку — 0. Слой
+    стоимости d сначала замыкается по бесплатным ходам, затем порождает
+    слой d + 1. Не реже чем раз в checkpoint_seconds состояние сохраняется
+    в файл .part (номер слоя, таблица, посещенные, слой), и повторный
+    запуск продолжает построение с сохраненного слоя"""
+    size = rows * cols
+    k = len(tiles)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = _paths(directory, _name(goal, rows, cols, tiles))
+    if paths["pdb"].exists():
+        log(f"База {paths['pdb']} уже построена")
+        return paths["pdb"]
+    moves = board.move_table(rows, cols)
+    bits = board.cell_bits(size)  # позиции кодируются так же, как фишки
+    mask = (1 << bits) - 1
+    entries = arrangements(k, size)
+
+    visited_size = (entries * size + 7) // 8
+    if paths["part"].exists():
+        data = paths["part"].read_bytes()
+        depth, = struct.unpack_from("<Q", data)
+        offset = 8 + entries + visited_size
+        table = bytearray(data[8:8 + entries])
+        visited = bytearray(data[8 + entries:offset])
+        layer = array('Q')
+        layer.frombytes(data[offset:])
+        del data
+        log(f"Продолжение построения {paths['pdb'].name} со слоя {depth}")
+    else:
+        depth = 0
+        table = bytearray([UNKNOWN]) * entries
+        visited = bytearray(visited_size)
+        goal_positions = board.tile_positions(goal, size)
+        # код состояния: пустая клетка в младших битах, затем позиции фишек
+        root = goal_positions[0]
+        for i, tile in enumerate(tiles):
+            root |= goal_positions[tile] << (bits * (i + 1))
+        index = rank_partial([goal_positions[tile] for tile in tiles],
+                             size) * size
+        visited[index >> 3] |= 1 << (index & 7)
+        layer = array('Q', [root])
+
+    def decode(code):
+        return [(code >> (bits * (i + 1))) & mask for i in range(k)]
+
+    def checkpoint():
+        # запись во временный файл и замена: прерванная запись не портит
+        # предыдущую контрольную точку
+        with open(paths["part.tmp"], "wb") as file:
+            file.write(struct.pack("<Q", depth))
+            file.write(table)
+            file.write(visited)
+            layer.tofile(file)
+        os.replace(paths["part.tmp"], paths["part"])
+
+    last_checkpoint = time.monotonic()
+    while layer:
+        # замыкание слоя по бесплатным ходам пустой клетки
+        stack = list(layer)
+        closed = array('Q')
+        while stack:
+            code = stack.pop()
+            closed.append(code)
+            blank = code & mask
+            positions = decode(code)
+            rank = rank_partial(positions, size)
+            if table[rank] == UNKNOWN:
+                table[rank] = depth
+            for _, new_blank in moves[blank]:
+                if new_blank in positions:
+                    continue
+                index = rank * size + new_blank
+                if not visited[index >> 3] & (1 << (index & 7)):
+                    visited[index >> 3] |= 1 << (index & 7)
+                    stack.append(code - blank + new_blank)
+        # ходы фишками шаблона порождают следующий слой
+        next_layer = array('Q')
+        for code in closed:
+            blank = code & mask
+            positions = decode(code)
+            for _, new_blank in moves[blank]:
+                if new_blank not in positions:
+                    continue
+                i = positions.index(new_blank)
+                positions[i] = blank
+                index = rank_partial(positions, size) * size + new_blank
+                positions[i] = new_blank
+                if not visited[index >> 3] & (1 << (index & 7)):
+                    visited[index >> 3] |= 1 << (index & 7)
+                    next_layer.append(
+                        code - blank + new_blank +
+                        ((blank - new_blank) << (bits * (i + 1))))
+        log(f"{paths['pdb'].name}: слой {depth}, "
+            f"состояний {len(closed)}")
+        layer = next_layer
+        depth += 1
+        if time.monotonic() - last_checkpoint >= checkpoint_seconds:
+            checkpoint()
+            last_checkpoint = time.monotonic()
+
+    paths["pdb"].write_bytes(table)
+    paths["json"].write_text(json.dumps({
+        "rows": rows, "cols": cols, "goal": goal, "tiles": list(tiles),
+        "entries": entries, "max": depth - 1,
+    }))
+    paths["part"].unlink(missing_ok=True)
+    log(f"База {paths['pdb']} построена")
+    return paths["pdb"]
+
+
+def open_database(goal: int, rows: int, cols: int, tiles: tuple[int],
+                  directory: Path = DEFAULT_DIR) -> PatternDatabase:
+    """Отображение построенной базы в память"""
+    path = _paths(directory, _name(goal, rows, cols, tiles))["pdb"]
+    if not path.exists():
+        raise FileNotFoundError(
+            f"База {path} не построена. Постройте ее командой: "
+            f"python -m npuzzle.pdb build --size {rows}x{cols} "
+            f"--goal {','.join(map(str, board.cells(goal, rows * cols)))} "
+            f"--pattern {','.join(map(str, tiles))}")
+    with open(path, "rb") as file:
+        table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return PatternDatabase(tiles, rows * cols, table)
+
+
+def load(goal: int, rows: int = board.ROWS, cols: int = board.COLS,
+         patterns=None, directory: Path = DEFAULT_DIR) -> AdditivePDB:
+    """Аддитивная эвристика из построенных баз шаблонов patterns
+    (по умолчанию — DEFAULT_PARTITIONS для размера поля)"""
+    if patterns is None:
+        patterns = default_patterns(goal, rows, cols)
+    return AdditivePDB([open_database(goal, rows, cols, tiles, directory)
+                        for tiles in patterns], rows * cols)
+
+
+def _parse_goal(text: str | None, rows: int, cols: int) -> int:
+    if text is None:  # фишки по порядку, пустая клетка в конце
+        cells = list(range(1, rows * cols)) + [0]
+    else:
+        cells = [int(cell) for cell in text.split(",")]
+    return board.pack([cells])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m npuzzle.pdb",
+        description="Построение аддитивных баз данных шаблонов")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser(
+        "build", help="построить (или продолжить строить) базы")
+    build_parser.add_argument("--size", default="4x4",
+                              help="размер поля, например 4x4")
+    build_parser.add_argument("--goal",
+                              help="целевое поле по строкам через запятую, "
+                                   "0 — пустая клетка")
+    build_parser.add_argument("--partition",
+                              help="размеры шаблонов, например 6-6-3")
+    build_parser.add_argument("--pattern", action="append",
+                              help="фишки шаблона через запятую "
+                                   "(можно повторять)")
+    build_parser.add_argument("--dir", type=Path, default=DEFAULT_DIR,
+                              help="каталог с базами")
+    build_parser.add_argument("--checkpoint", type=float, default=60,
+                              help="период сохранения прогресса, секунд")
+    args = parser.parse_args(argv)
+
+    rows, cols = (int(side) for side in args.size.split("x"))
+    goal = _parse_goal(args.goal, rows, cols)
+    tiles = list(range(1, rows * cols))
+    if args.pattern:
+        patterns = [tuple(int(tile) for tile in pattern.split(","))
+                    for pattern in args.pattern]
+    elif args.partition:
+        patterns = partition_tiles(
+            [int(k) for k in args.partition.split("-")], tiles)
+    else:
+        patterns = default_patterns(goal, rows, cols)
+    for tiles in patterns:
+        build(goal, rows, cols, tuple(tiles), args.dir, args.checkpoint)
+
+
+if __name__ == "__main__":
+    main()
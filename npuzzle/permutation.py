@@ -0,0 +1,64 @@
+"""Ранжирование перестановок и размещений, подсчет инверсий.
+
+Ранг — номер в лексикографическом порядке (код Лемера), поэтому по нему
+можно индексировать плоские массивы: множество посещенных состояний,
+базы шаблонов, таблицы расстояний.
+"""
+
+
+def inversions(sequence) -> int:
+    """Число инверсий последовательности различных чисел 0..n-1 за
+    O(n log n) (дерево Фенвика по значениям)"""
+    n = len(sequence)
+    tree = [0] * (n + 1)
+    count = 0
+    for seen, value in enumerate(sequence):
+        # сколько уже встреченных значений не больше value
+        i, not_greater = value + 1, 0
+        while i:
+            not_greater += tree[i]
+            i &= i - 1
+        count += seen - not_greater
+        i = value + 1
+        while i <= n:
+            tree[i] += 1
+            i += i & -i
+    return count
+
+
+def arrangements(k: int, n: int) -> int:
+    """Число размещений k различных элементов из n: n!/(n-k)!"""
+    count = 1
+    for i in range(k):
+        count *= n - i
+    return count
+
+
+def rank_partial(arrangement, n: int) -> int:
+    """Ранг размещения различных чисел 0..n-1 среди всех arrangements(k, n)
+    (совершенный хеш)"""
+    rank = used = 0
+    for i, value in enumerate(arrangement):
+        rank = (rank * (n - i) + value
+                - (used & ((1 << value) - 1)).bit_count())
+        used |= 1 << value
+    return rank
+
+
+def unrank_partial(rank: int, k: int, n: int) -> list[int]:
+    """Размещение длины k по рангу, обратное к rank_partial"""
+    digits = []
+    for i in range(k - 1, -1, -1):
+        rank, digit = divmod(rank, n - i)
+        digits.append(digit)
+    free = list(range(n))
+    return [free.pop(digit) for digit in reversed(digits)]
+
+
+def rank(permutation) -> int:
+    """Код Лемера перестановки чисел 0..n-1 (ранг от 0 до n!-1)"""
+    return rank_partial(permutation, len(permutation))
+
+
+def unrank(rank: int, n: int) -> list[int]:
+    return unrank_partial(rank, n, n)
@@ -0,0 +1,488 @@
+"""Поиск по схеме general_search из лабораторных без интерактивного ввода.
+
+Node, Problem, general_search и функции очереди (bfs, dfs_limited, A_star,
+greedy) скриптов лабораторных собраны в одном модуле с общими для всех
+алгоритмов параметрами Problem: эвристика (None — неинформированный
+поиск), лимит глубины, бюджеты вершин и времени, трассировщик, метрики и
+размеры поля.
+
+    from npuzzle import search
+    path = search.solve(start, goal, "astar", "manhattan")
+    # [(упакованное состояние, код действия), ...]
+
+Скрипты лабораторных — только диалог (npuzzle.interactive) поверх этого
+модуля.
+
+Импорт модуля ничего не строит и не читает: эвристика (и модуль
+npuzzle.heuristics) загружается при создании Problem.
+"""
+import math
+import time
+from collections import deque
+from heapq import heappop, heappush
+from itertools import count
+
+from npuzzle import board, trace
+from npuzzle.metrics import Metrics, TimedHeuristic
+
+
+class NoSolution(Exception):
+    pass
+
+
+class BudgetExceeded(Exception):
+    """Поиск остановлен по бюджету вершин, времени или глубины углубления —
+    решение может существовать"""
+
+
+class Node:
+    __slots__ = ('id', 'state', 'blank_pos', 'parent', 'action', 'path_cost',
+                 'depth', 'h', 'shape')
+    node_counter = 0
+
+    def __init__(self, state, parent=None, operator=None, path_cost=0, depth=0,
+                 blank_pos: int | None = None, h=0, shape=None):
+        self.id = Node.node_counter
+        Node.node_counter += 1
+        self.state: int = state  # упакованное поле, см. npuzzle.board
+        # (строки, столбцы) поля; потомок берет их у родителя
+        self.shape = shape or (parent.shape if parent
+                               else (board.ROWS, board.COLS))
+        self.blank_pos = (blank_pos if blank_pos is not None
+                          else board.blank_index(
+                              state, self.shape[0] * self.shape[1]))
+        self.parent = parent  # Ссылка на родительский узел
+        self.action = operator  # Код действия, приведшего к этому узлу
+        self.path_cost = path_cost  # Стоимость пути
+        self.depth = depth  # Глубина
+        self.h = h  # Значение эвристики (0 у неинформированного поиска)
+
+    def __repr__(self):
+        parent_id = self.parent.id if self.parent else None
+        return (f"Node ID: {self.id}, Parent ID: {parent_id}, "
+                f"Action: {board.operator_name(self.action)}, "
+                f"Path-Cost: {self.path_cost}, "
+                f"Depth: {self.depth}, State:\n{self.state_str()}")
+
+    def state_str(self):
+        return board.state_str(self.state, *self.shape)
+
+
+class PriorityQueue:
+    """Кайма с приоритетами на двоичной куче (heapq)"""
+
+    def __init__(self, priority, nodes=(), label="{}-estimation"):
+        self.priority = priority  # оценка вычисляется один раз при вставке
+        self.label = label  # название оценки, {} — имя эвристики
+        self._heap = []
+        self._counter = count()  # порядок вставки разрешает равенство оценок
+        self.extend(nodes)
+
+    def extend(self, nodes):
+        for node in nodes:
+            heappush(self._heap,
+                     (self.priority(node), next(self._counter), node))
+
+    def popleft(self) -> Node:
+        return heappop(self._heap)[-1]
+
+    def items(self) -> list[tuple[int, Node]]:
+        """Вершины каймы в порядке раскрытия вместе с их оценками"""
+        return [(priority, node) for priority, _, node in sorted(self._heap)]
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        return (node for _, node in self.items())
+
+
+class Problem:
+    def __init__(self, init_state, goal_state, mode='silent', heuristic=None,
+                 limit=None, tracer=None, metrics=None, rows=None,
+                 cols=None, max_nodes=None, max_seconds=None) -> None:
+        """init_state и goal_state — кортежи строк поля, как в лабораторных.
+        heuristic — имя из heuristics.HEURISTICS или None, limit — лимит
+        глубины (None — без лимита). max_nodes и max_seconds — бюджеты
+        раскрытых вершин и времени поиска, при превышении general_search
+        бросает BudgetExceeded"""
+        self.init_state = board.pack(init_state)
+        self.goal_state = board.pack(goal_state)
+        # размеры поля, по умолчанию — как у init_state
+        self.rows = rows or len(init_state)
+        self.cols = cols or len(init_state[0])
+        self.bits = board.cell_bits(self.rows * self.cols)  # см. board
+        self.moves = board.move_table(self.rows, self.cols)
+        # счетчики и время фаз поиска, см. npuzzle.metrics
+        self.metrics = metrics or Metrics()
+        # состояние -> глубина, на которой оно раскрыто
+        self.visited: dict[int, int] = {}
+        # глубины из предыдущей итерации углубления (см. deepen)
+        self.shallowest: dict[int, int] = {}
+        self.cutoff = False  # были ли вершины, отсеченные лимитом
+        self.tree = None  # дерево последнего compact_search
+        self.limit = limit
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.deadline = None  # по perf_counter, ставится при начале поиска
+        self.heuristic_name = heuristic
+        self.heuristic = None
+        if heuristic is not None:
+            from npuzzle import heuristics
+            with self.metrics.phase("init"):  # база шаблонов грузится здесь
+                self.heuristic = TimedHeuristic(
+                    heuristics.heuristic(heuristic, self.goal_state,
+                                         self.rows, self.cols),
+                    self.metrics)
+        self.mode = mode
+        # трассировщик по режиму, если не задан явно (см. npuzzle.trace)
+        self.tracer = tracer or trace.tracer(mode, self.rows, self.cols)
+
+    @property
+    def count_new_states(self):
+        """Количество полученных новых состояний"""
+        return self.metrics.generated
+
+    @count_new_states.setter
+    def count_new_states(self, value):
+        self.metrics.generated = value
+
+    def root(self) -> Node:
+        h = self.heuristic(self.init_state) if self.heuristic else 0
+        return Node(self.init_state, h=h, shape=(self.rows, self.cols))
+
+    def deepen(self, limit):
+        """Переход к следующей итерации углубления с новым лимитом.
+
+        Карта глубин visited прошлой итерации сохраняется в shallowest:
+        состояние, уже достигнутое строго меньшей глубиной, повторно не
+        раскрывается. Равная глубина не отсекается, потому что на прошлой
+        итерации поддерево было обрезано меньшим лимитом"""
+        self.shallowest, self.visited = self.visited, {}
+        self.cutoff = False
+        self.limit = limit
+
+    def goal_test(self, state):
+        return state == self.goal_state
+
+    def check_budget(self):
+        """Вызывается перед каждым раскрытием. Время сверяется раз в 256
+        раскрытий: perf_counter на каждом стоил бы заметную долю раскрытия"""
+        expanded = self.metrics.expanded
+        if self.max_nodes is not None and expanded >= self.max_nodes:
+            raise BudgetExceeded(
+                f"превышен лимит вершин: {self.max_nodes}")
+        if (self.deadline is not None and not expanded & 255
+                and time.perf_counter() > self.deadline):
+            raise BudgetExceeded(
+                f"превышен лимит времени: {self.max_seconds} с")
+
+    def expand(self, node, operators) -> list[Node]:
+        self.visited[node.state] = node.depth
+        self.metrics.expand(node.depth)
+        children: list[Node] = []
+        if self.limit is not None and node.depth >= self.limit:
+            self.cutoff = True
+            self.tracer.cutoff(node, self.limit)
+            return children
+
+        self.metrics.generated += len(operators)
+        depth = node.depth + 1
+        heuristic = self.heuristic
+        for operator, new_blank_pos in operators:
+            new_state = board.move(node.state, node.blank_pos,
+                                   new_blank_pos, self.bits)
+            # повтор отбрасывается, если состояние уже раскрыто не глубже
+            if (self.visited.get(new_state, depth + 1) > depth and
+                    self.shallowest.get(new_state, depth) >= depth):
+                h = (heuristic.update(node.h, node.state, node.blank_pos,
+                                      new_blank_pos) if heuristic else 0)
+                children.append(Node(new_state, node, operator,
+                                     node.path_cost + 1, depth,
+                                     new_blank_pos, h))
+            else:
+                self.metrics.duplicates += 1
+                self.tracer.visited(new_state)
+        self.tracer.children(children)
+        return children
+
+    def expand_compact(self, tree, index: int) -> list[int]:
+        """expand для компактного дерева (npuzzle.tree.SearchTree): потомки
+        добавляются в tree, возвращаются их индексы. Состояние помечается
+        посещенным, когда порождено, поэтому в дереве по одной вершине на
+        состояние; для поиска в ширину первое порождение — на наименьшей
+        глубине"""
+        state, blank_pos = tree.states[index], tree.blanks[index]
+        depth = tree.depths[index] + 1
+        self.metrics.expand(depth - 1)
+        if self.limit is not None and depth > self.limit:
+            self.cutoff = True
+            self.tracer.cutoff(tree.view(index), self.limit)
+            return []
+        operators = self.moves[blank_pos]
+        self.metrics.generated += len(operators)
+        children = []
+        for operator, new_blank_pos in operators:
+            new_state = board.move(state, blank_pos, new_blank_pos,
+                                   self.bits)
+            if new_state not in self.visited:
+                self.visited.add(new_state)
+                children.append(tree.add(new_state, index, operator, depth,
+                                         new_blank_pos))
+            else:
+                self.metrics.duplicates += 1
+                self.tracer.visited(new_state)
+        self.tracer.children(children, tree.view)
+        return children
+
+
+def general_search(problem: Problem, queuing_fn, compact=False) -> Node:
+    """Вершина с целевым состоянием; путь — по ссылкам parent (solution).
+    compact — дерево поиска в компактных массивах (compact_search)"""
+    with problem.metrics.phase("search"):
+        if not board.solvable(problem.init_state, problem.goal_state,
+                              problem.rows, problem.cols):
+            raise NoSolution('нет решения !!!')  # разная четность полей
+        if compact:
+            return compact_search(problem, queuing_fn)
+        nodes = deque([problem.root()])  # создаем кайму
+        tracer = problem.tracer
+        if problem.max_seconds is not None and problem.deadline is None:
+            # у итераций углубления общий срок
+            problem.deadline = time.perf_counter() + problem.max_seconds
+        budgeted = (problem.max_nodes is not None
+                    or problem.deadline is not None)
+
+        while True:
+            if not nodes:
+                raise NoSolution('нет решения !!!')
+
+            node = nodes.popleft()
+            tracer.expanding(node)
+
+            if problem.goal_test(node.state):
+                return node
+            if budgeted:
+                problem.check_budget()
+
+            nodes = queuing_fn(nodes, problem.expand(
+                node, problem.moves[node.blank_pos]))
+            problem.metrics.observe(len(nodes), len(problem.visited))
+            if not tracer.enabled:
+                continue
+            if isinstance(nodes, PriorityQueue):
+                tracer.frontier(nodes, estimation=nodes.priority,
+                                label=nodes.label.format(
+                                    problem.heuristic_name))
+            else:
+                tracer.frontier(nodes)
+
+
+def compact_search(problem: Problem, queuing_fn) -> Node:
+    """Цикл general_search на компактном дереве: вершины каймы — индексы
+    в SearchTree, объекты Node создаются только для найденного пути,
+    посещенные состояния — биты в VisitedBitmap (для полей больше 3x3
+    битовая карта всех перестановок слишком велика, там — множество).
+    Только поиск в ширину: посещенные отмечаются при порождении (см.
+    Problem.expand_compact). Лимит глубины и бюджеты — как в
+    general_search"""
+    if queuing_fn is not bfs:
+        raise ValueError("Компактное дерево — только для поиска в ширину")
+    from npuzzle.tree import SearchTree, VisitedBitmap
+    size = problem.rows * problem.cols
+    problem.visited = VisitedBitmap(size) if size <= board.SIZE else set()
+    problem.visited.add(problem.init_state)
+    tree = problem.tree = SearchTree(problem.rows, problem.cols)
+    nodes = deque([tree.add(problem.init_state)])  # создаем кайму
+    tracer = problem.tracer
+    if problem.max_seconds is not None and problem.deadline is None:
+        problem.deadline = time.perf_counter() + problem.max_seconds
+    budgeted = problem.max_nodes is not None or problem.deadline is not None
+
+    while True:
+        if not nodes:
+            raise NoSolution('нет решения !!!')
+
+        index = nodes.popleft()
+        tracer.expanding(index, tree.view)
+
+        if problem.goal_test(tree.states[index]):
+            node = None  # путь — цепочка Node с номерами вершин дерева
+            for i in tree.path(index):
+                node = Node(tree.states[i], node, tree.action(i),
+                            tree.depths[i], tree.depths[i], tree.blanks[i],
+                            shape=(problem.rows, problem.cols))
+                node.id = i
+            return node
+        if budgeted:
+            problem.check_budget()
+
+        nodes = queuing_fn(nodes, problem.expand_compact(tree, index))
+        problem.metrics.observe(len(nodes), len(problem.visited))
+        tracer.frontier(nodes, tree.view)
+
+
+def iterative_deepening_search(problem: Problem, queuing_fn=None,
+                               max_limit=None, on_iteration=None) -> Node:
+    """Поиск с итеративным углублением: лимит растет с 0, пока не найдено
+    решение. Первое найденное решение имеет минимальную длину.
+    Превышение max_limit — BudgetExceeded: прошлая итерация отсекала
+    вершины, так что решение глубже лимита может быть.
+    on_iteration(limit) вызывается после каждой итерации"""
+    for limit in count():
+        if max_limit is not None and limit > max_limit:
+            raise BudgetExceeded(f"превышен лимит глубины: {max_limit}")
+        problem.deepen(limit)
+        try:
+            return general_search(problem, queuing_fn or dfs_limited)
+        except NoSolution:
+            if not problem.cutoff:  # пространство исчерпано без отсечений
+                raise
+        finally:
+            if on_iteration:
+                on_iteration(limit)
+
+
+def bfs(nodes: deque[Node], children: list[Node]) -> deque[Node]:
+    nodes.extend(children)
+    return nodes
+
+
+def dfs_limited(nodes: deque[Node], children: list[Node]) -> deque[Node]:
+    # лимит глубины соблюдает Problem.expand: вершины на лимите не раскрываются
+    nodes.extendleft(reversed(children))
+    return nodes
+
+
+def A_star(nodes: deque[Node] | PriorityQueue, children: list[Node]
+           ) -> PriorityQueue:
+    if not isinstance(nodes, PriorityQueue):
+        nodes = PriorityQueue(lambda node: node.h + node.depth, nodes,
+                              "A*-estimation({} + g)")
+    nodes.extend(children)
+    return nodes
+
+
+def greedy(nodes: deque[Node] | PriorityQueue, children: list[Node]
+           ) -> PriorityQueue:
+    if not isinstance(nodes, PriorityQueue):
+        nodes = PriorityQueue(lambda node: node.h, nodes)
+    nodes.extend(children)
+    return nodes
+
+
+def distance_descent(table):
+    """Функция очереди по полной таблице расстояний
+    (npuzzle.distance.DistanceTable): в кайме остается только потомок,
+    который на 1 ход ближе к цели, так что поиск превращается в спуск по
+    таблице. Для неразрешимой головоломки кайма пустеет сразу"""
+    def descent(nodes: deque[Node], children: list[Node]) -> deque[Node]:
+        nodes.clear()
+        if not children:
+            return nodes
+        parent = children[0].parent
+        d = table.distance(parent.state, parent.blank_pos)
+        for child in children:
+            if d and table.distance(child.state, child.blank_pos) == d - 1:
+                nodes.append(child)
+                break
+        return nodes
+    return descent
+
+
+def grid(tiles, rows: int | None = None,
+         cols: int | None = None) -> tuple[tuple[int]]:
+    """Поле (кортеж строк) из вложенного или плоского списка фишек.
+    Размеры плоского поля — rows/cols, по умолчанию оно квадратное.
+    ValueError, если фишки — не перестановка 0..rows*cols-1"""
+    if tiles and isinstance(tiles[0], (list, tuple)):
+        rows, cols = len(tiles), len(tiles[0])
+        tiles = [tile for row in tiles for tile in row]
+    elif rows is None and cols is None:
+        rows = cols = math.isqrt(len(tiles))
+    elif rows is None:
+        rows = len(tiles) // cols
+    elif cols is None:
+        cols = len(tiles) // rows
+    if (not rows or rows * cols != len(tiles)
+            or sorted(tiles) != list(range(len(tiles)))):
+        raise ValueError(f"Поле {list(tiles)} не является перестановкой "
+                         f"чисел 0..{rows * cols - 1} для размера "
+                         f"{rows}x{cols}")
+    return tuple(tuple(tiles[r * cols:(r + 1) * cols]) for r in range(rows))
+
+
+def solution(node: Node) -> list[tuple[int, int | None]]:
+    """Путь от корня до node: пары (состояние, код действия)"""
+    path = []
+    while node:
+        path.append((node.state, node.action))
+        node = node.parent
+    path.reverse()
+    return path
+
+
+def node_from_path(path: list[tuple[int, int | None]], shape,
+                   heuristic=None) -> Node:
+    """Обратное к solution: цепочка Node по парам (состояние, код
+    действия) — для путей решателей без дерева Node (двунаправленный
+    поиск, HDA* и т.п.). heuristic(state) заполняет Node.h"""
+    node = None
+    for depth, (state, action) in enumerate(path):
+        node = Node(state, node, action, depth, depth,
+                    h=heuristic(state) if heuristic else 0, shape=shape)
+    return node
+
+
+# имя -> (функция очереди, нужна ли эвристика)
+ALGORITHMS = {
+    "bfs": (bfs, False),
+    "iddfs": (dfs_limited, False),
+    "astar": (A_star, True),
+    "greedy": (greedy, True),
+}
+# находят кратчайшее решение (все эвристики HEURISTICS допустимы)
+OPTIMAL = ("bfs", "iddfs", "astar")
+
+
+def solve(start, goal, algorithm: str = "astar",
+          heuristic: str | None = "manhattan",
+          **kwargs) -> list[tuple[int, int | None]]:
+    """Решение одной пары полей алгоритмом из ALGORITHMS. kwargs
+    передаются в Problem (mode, limit, tracer, metrics, rows, cols,
+    max_nodes, max_seconds)"""
+    try:
+        queuing_fn, informed = ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"Неизвестный алгоритм: {algorithm}. Доступны: "
+                         f"{', '.join(ALGORITHMS)}") from None
+    problem = Problem(start, goal, heuristic=heuristic if informed else None,
+                      **kwargs)
+    if algorithm == "iddfs":  # limit — наибольший лимит углубления
+        return solution(iterative_deepening_search(problem, queuing_fn,
+                                                   problem.limit))
+    return solution(general_search(problem, queuing_fn))
+
+
+def result(start, goal, algorithm: str = "astar",
+           heuristic: str | None = "manhattan", solver=None,
+           **kwargs) -> dict:
+    """solve без исключений поиска: запись со статусом ("solved",
+    "unsolvable", "budget"), длиной и ходами решения и счетчиками — для
+    пакетного вывода (npuzzle.cli) и сервиса (npuzzle.service). solver —
+    функция с интерфейсом solve, по умолчанию solve"""
+    metrics = kwargs.setdefault("metrics", Metrics())
+    start_time = time.perf_counter()
+    try:
+        path = (solver or solve)(start, goal, algorithm, heuristic, **kwargs)
+    except BudgetExceeded as e:
+        record = {"status": "budget", "error": str(e)}
+    except NoSolution as e:
+        record = {"status": "unsolvable", "error": str(e)}
+    else:
+        record = {"status": "solved", "length": len(path) - 1,
+                  "moves": [board.operator_name(action)
+                            for _, action in path[1:]]}
+    record.update(expanded=metrics.expanded, generated=metrics.generated,
+                  seconds=round(time.perf_counter() - start_time, 6))
+    return record
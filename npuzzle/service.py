@@ -0,0 +1,356 @@
+"""Асинхронный решатель для веб-бэкенда: await solve(start, goal, ...).
+
+Поиск (npuzzle.search) идет в отдельных процессах, цикл событий не
+блокируется; обращения к кэшу (в том числе к хранилищу на диске) идут в
+отдельном потоке. У каждого запроса свои бюджеты вершин и времени
+(search.Problem.max_nodes, max_seconds), сверху ограниченные бюджетами
+сервиса; бюджет времени есть всегда. Процесс, не уложившийся в срок,
+завершается и заменяется новым. Одновременные одинаковые запросы ждут
+одно вычисление, отмена одного из ожидающих не отменяет его для
+остальных. Кратчайшие решения (search.OPTIMAL) запоминаются в кэше
+npuzzle.cache и на повторные, симметричные и перенумерованные поля
+отдаются без поиска.
+
+Счетчики сервиса — в Metrics (expanded, generated — суммы по всем
+вычислениям, фаза "request" — суммарное время ответов), число запросов и
+объединенных запросов, завершенных по сроку процессов, задержки
+последних запросов (p50, p95, max) и счетчики кэша — в stats().
+
+Сервер — HTTP/1.1 поверх TCP или Unix-сокета, соединение на запрос:
+
+    python -m npuzzle.service --unix /tmp/npuzzle.sock
+    curl --unix-socket /tmp/npuzzle.sock http://localhost/solve \\
+        -d '{"start": [7,4,2,3,5,8,1,0,6], "goal": [1,2,3,4,0,5,6,7,8]}'
+    curl --unix-socket /tmp/npuzzle.sock http://localhost/stats
+
+POST /solve принимает JSON с полями start, goal (плоские или вложенные
+списки фишек, 0 — пустая клетка), rows, cols, algorithm, heuristic,
+max_nodes, max_seconds и отвечает записью search.result с полем latency
+(и cached: true для решения из кэша).
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from npuzzle import board, heuristics, search
+from npuzzle.cache import SolutionCache
+from npuzzle.metrics import Metrics
+
+
+def _cap(requested, limit):
+    """Бюджет запроса, ограниченный бюджетом сервиса (None — без лимита)"""
+    if requested is None:
+        return limit
+    return requested if limit is None else min(requested, limit)
+
+
+def _kill(pool: ProcessPoolExecutor):
+    """Остановка пула вместе с занятым процессом: shutdown ждал бы конца
+    поиска. У ProcessPoolExecutor нет открытого способа завершить
+    процессы, поэтому — через _processes"""
+    for process in list(pool._processes.values()):
+        process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class SolverService:
+    def __init__(self, workers: int | None = None,
+                 max_nodes: int | None = None,
+                 max_seconds: float = 30.0, grace: float = 1.0,
+                 history: int = 1000, cache: SolutionCache | None = None):
+        """workers — число процессов поиска. max_nodes, max_seconds —
+        бюджеты сервиса на запрос (max_nodes=None — без лимита вершин).
+        Бюджет времени проверяется внутри поиска; если процесс не ответил
+        и через grace секунд после срока, запрос завершается без него, а
+        процесс — принудительно. history — сколько последних задержек
+        хранить для stats(). cache — кэш решений (None — без кэша),
+        закрывается вместе с сервисом"""
+        if max_seconds is None:
+            raise ValueError("нужен бюджет времени max_seconds")
+        self.workers = workers or os.cpu_count() or 1
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.grace = grace
+        # по пулу из одного процесса на место: зависший процесс можно
+        # завершить, не трогая чужие запросы. None — пул еще не создан
+        self.pools: list[ProcessPoolExecutor | None] = [None] * self.workers
+        self._free: asyncio.Queue[int] | None = None  # свободные места
+        self.killed = 0  # процессов, завершенных по сроку
+        self.cache = cache
+        # dbm и OrderedDict кэша не потокобезопасны — один поток
+        self._cache_thread = ThreadPoolExecutor(1) if cache else None
+        self.metrics = Metrics()
+        self.requests = 0
+        self.coalesced = 0  # запросов, дождавшихся чужого вычисления
+        self.latencies: deque[float] = deque(maxlen=history)
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+
+    async def solve(self, start, goal, algorithm: str = "astar",
+                    heuristic: str = "manhattan",
+                    max_nodes: int | None = None,
+                    max_seconds: float | None = None,
+                    rows: int | None = None, cols: int | None = None
+                    ) -> dict:
+        """Запись search.result для пары полей (вложенные или плоские
+        списки фишек) и задержка ответа latency"""
+        start = search.grid(start, rows, cols)
+        goal = search.grid(goal, len(start), len(start[0]))
+        if algorithm not in search.ALGORITHMS:
+            raise ValueError(f"Неизвестный алгоритм: {algorithm}. Доступны: "
+                             f"{', '.join(search.ALGORITHMS)}")
+        if not search.ALGORITHMS[algorithm][1]:
+            heuristic = None
+        elif heuristic not in heuristics.HEURISTICS:
+            raise ValueError(f"Неизвестная эвристика: {heuristic}. Доступны: "
+                             f"{', '.join(heuristics.HEURISTICS)}")
+        key = (start, goal, algorithm, heuristic,
+               _cap(max_nodes, self.max_nodes),
+               _cap(max_seconds, self.max_seconds))
+        self.requests += 1
+        start_time = time.perf_counter()
+        with self.metrics.phase("request"):
+            record = None
+            if self.cache is not None and algorithm in search.OPTIMAL:
+                record = await asyncio.get_running_loop().run_in_executor(
+                    self._cache_thread, self._cached, start, goal)
+            if record is None:
+                future = self._in_flight.get(key)
+                if future is None:
+                    future = asyncio.ensure_future(self._run(key))
+                    self._in_flight[key] = future
+                    future.add_done_callback(partial(self._done, key))
+                else:
+                    self.coalesced += 1
+                record = dict(await asyncio.shield(future))
+        latency = time.perf_counter() - start_time
+        self.latencies.append(latency)
+        record["latency"] = round(latency, 6)
+        return record
+
+    def _cached(self, start, goal) -> dict | None:
+        """Запись для решения из кэша или None"""
+        actions = self.cache.get(board.pack(start), board.pack(goal),
+                                 len(start), len(start[0]))
+        if actions is None:
+            return None
+        return {"status": "solved", "length": len(actions),
+                "moves": [board.OPERATORS[action] for action in actions],
+                "expanded": 0, "generated": 0, "seconds": 0.0,
+                "cached": True}
+
+    def _done(self, key, future):
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+    async def _run(self, key) -> dict:
+        start, goal, algorithm, heuristic, max_nodes, max_seconds = key
+        loop = asyncio.get_running_loop()
+        if self._free is None:
+            self._free = asyncio.Queue()
+            for slot in range(self.workers):
+                self._free.put_nowait(slot)
+        slot = await self._free.get()
+        try:
+            if self.pools[slot] is None:
+                # не fork: процессы пула не должны наследовать сокеты
+                # соединений, иначе клиент не дождется их закрытия
+                self.pools[slot] = ProcessPoolExecutor(
+                    1, multiprocessing.get_context("forkserver"))
+            call = loop.run_in_executor(
+                self.pools[slot],
+                partial(search.result, start, goal, algorithm, heuristic,
+                        max_nodes=max_nodes, max_seconds=max_seconds))
+            try:
+                record = await asyncio.wait_for(call,
+                                                max_seconds + self.grace)
+            except asyncio.TimeoutError:
+                # поиск застрял вне проверок бюджета — процесс не
+                # освободится сам, место получит новый процесс
+                _kill(self.pools[slot])
+                self.pools[slot] = None
+                self.killed += 1
+                return {"status": "budget",
+                        "error": f"превышен лимит времени: {max_seconds} с"}
+            except BrokenProcessPool:
+                self.pools[slot] = None  # процесс упал, следующий — новый
+                raise
+        finally:
+            self._free.put_nowait(slot)
+        self.metrics.expanded += record["expanded"]
+        self.metrics.generated += record["generated"]
+        if (self.cache is not None and algorithm in search.OPTIMAL
+                and record["status"] == "solved"):
+            await loop.run_in_executor(
+                self._cache_thread,
+                partial(self.cache.put, board.pack(start), board.pack(goal),
+                        [board.OPERATORS.index(move)
+                         for move in record["moves"]],
+                        len(start), len(start[0])))
+        return record
+
+    def stats(self) -> dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(q):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "workers": self.workers,
+            "killed": self.killed,
+            "latency": {"p50": percentile(0.5), "p95": percentile(0.95),
+                        "max": latencies[-1] if latencies else None},
+            "cache": self.cache.as_dict() if self.cache else None,
+            "metrics": self.metrics.as_dict(),
+        }
+
+    def close(self):
+        for slot, pool in enumerate(self.pools):
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+                self.pools[slot] = None
+        if self._cache_thread is not None:
+            self._cache_thread.shutdown()
+            self._cache_thread = None
+        if self.cache is not None:
+            self.cache.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+
+_service: SolverService | None = None
+
+
+async def solve(start, goal, algorithm: str = "astar",
+                heuristic: str = "manhattan", **kwargs) -> dict:
+    """SolverService.solve общего сервиса процесса (создается при первом
+    вызове с настройками по умолчанию)"""
+    global _service
+    if _service is None:
+        _service = SolverService()
+    return await _service.solve(start, goal, algorithm, heuristic, **kwargs)
+
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+async def _route(service: SolverService, method: str, path: str,
+                 body: bytes) -> tuple[int, dict]:
+    if path == "/stats":
+        if method != "GET":
+            return 405, {"error": "нужен GET"}
+        return 200, service.stats()
+    if path == "/solve":
+        if method != "POST":
+            return 405, {"error": "нужен POST"}
+        try:
+            request = json.loads(body)
+            record = await service.solve(
+                request["start"], request["goal"],
+                request.get("algorithm", "astar"),
+                request.get("heuristic", "manhattan"),
+                request.get("max_nodes"), request.get("max_seconds"),
+                request.get("rows"), request.get("cols"))
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {"error": f"неверный запрос: {e!r}"}
+        return 200, record
+    return 404, {"error": f"нет такого пути: {path}"}
+
+
+async def _handle(service: SolverService, reader: asyncio.StreamReader,
+                  writer: asyncio.StreamWriter):
+    """Один запрос HTTP/1.1 на соединение"""
+    try:
+        method, path, _ = (await reader.readline()).decode(
+            "latin-1").split(" ", 2)
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(
+            int(headers.get("content-length", 0)))
+        status, payload = await _route(service, method, path, body)
+    except (ValueError, asyncio.IncompleteReadError) as e:
+        status, payload = 400, {"error": f"неверный запрос HTTP: {e!r}"}
+    except Exception as e:  # например, упал процесс пула
+        status, payload = 500, {"error": repr(e)}
+    data = json.dumps(payload, ensure_ascii=False).encode()
+    writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                 "Content-Type: application/json; charset=utf-8\r\n"
+                 f"Content-Length: {len(data)}\r\n"
+                 "Connection: close\r\n\r\n".encode() + data)
+    try:
+        await writer.drain()
+    except ConnectionError:
+        pass  # клиент ушел, не дождавшись ответа
+    finally:
+        writer.close()
+
+
+async def serve(service: SolverService, host: str = "127.0.0.1",
+                port: int = 8080, unix: str | None = None):
+    """Сервер HTTP на TCP host:port или на Unix-сокете unix"""
+    handler = partial(_handle, service)
+    if unix:
+        return await asyncio.start_unix_server(handler, unix)
+    return await asyncio.start_server(handler, host, port)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m npuzzle.service",
+        description="Сервер решателя: POST /solve, GET /stats")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix", help="путь Unix-сокета вместо TCP")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--max-nodes", type=int,
+                        help="бюджет раскрытых вершин на запрос")
+    parser.add_argument("--max-seconds", type=float, default=30.0,
+                        help="бюджет времени на запрос (по умолчанию 30)")
+    parser.add_argument("--cache-size", type=int, default=10000,
+                        help="решений в кэше памяти, 0 — без кэша")
+    parser.add_argument("--cache-file",
+                        help="хранилище кэша на диске (dbm)")
+    return parser.parse_args(argv)
+
+
+async def _main(args):
+    cache = (SolutionCache(args.cache_size, args.cache_file)
+             if args.cache_size else None)
+    async with SolverService(args.workers, args.max_nodes,
+                             args.max_seconds, cache=cache) as service:
+        server = await serve(service, args.host, args.port, args.unix)
+        where = args.unix or f"http://{args.host}:{args.port}"
+        print(f"Решатель слушает {where}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None) -> int:
+    try:
+        asyncio.run(_main(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
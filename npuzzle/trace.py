@@ -0,0 +1,151 @@
+"""Трассировка поиска: что происходит на каждом шаге раскрытия.
+
+Поиск сообщает о событиях вызовами методов трассировщика и передает сами
+вершины, а не строки. Форматирует их только трассировщик, которому это
+нужно, поэтому с NullTracer в режиме 'silent' строки не строятся вовсе.
+
+- NullTracer — трассировка выключена;
+- ConsoleTracer — прежний вывод Problem.message: блоки между чертами, в
+  пошаговом режиме — ожидание Enter;
+- EventTracer — события в виде словарей (в список или JSON Lines в поток).
+
+Вершина — объект с атрибутами Node (id, parent, action, depth,
+path_cost, state, у A* еще h). Если у поиска вершины другие (индексы
+компактного дерева), describe переводит их в такой объект.
+"""
+from npuzzle import board
+
+
+class NullTracer:
+    enabled = False
+
+    def expanding(self, node, describe=None):
+        """Вершина выбрана из каймы для раскрытия"""
+
+    def visited(self, state):
+        """Потомок отброшен: состояние уже посещено"""
+
+    def children(self, children, describe=None):
+        """Новые вершины, добавленные после раскрытия"""
+
+    def frontier(self, nodes, describe=None, estimation=None, label=None):
+        """Кайма после раскрытия. estimation(node) — оценка вершины в
+        кайме с приоритетами, label — ее название"""
+
+    def cutoff(self, node, limit):
+        """Вершина достигла лимита глубины и не раскрывается"""
+
+
+class ConsoleTracer(NullTracer):
+    enabled = True
+
+    def __init__(self, step: bool = False, rows: int = board.ROWS,
+                 cols: int = board.COLS):
+        self.step = step  # ждать Enter после каждого сообщения
+        self.rows, self.cols = rows, cols
+
+    def message(self, *args, **kwargs):
+        print("-"*40)
+        print(*args, **kwargs)
+        print("-"*40)
+        if self.step:
+            input("\nНажмите Enter для продолжения...\n")
+
+    def expanding(self, node, describe=None):
+        node = describe(node) if describe else node
+        self.message(f"Текущая вершина, выбранная для раскрытия "
+                     f"на данном шаге: \n{node}")
+
+    def visited(self, state):
+        self.message(f"Состояние \n"
+                     f"{board.state_str(state, self.rows, self.cols)}\n"
+                     "уже посещено")
+
+    def children(self, children, describe=None):
+        if describe:
+            children = map(describe, children)
+        self.message("Добавленные после раскрытия новые вершины:",
+                     *children, sep='\n')
+
+    def frontier(self, nodes, describe=None, estimation=None, label=None):
+        if estimation:
+            lines = [f"{describe(node) if describe else node}\t"
+                     f"{label} = {estimation(node)}" for node in nodes]
+        else:
+            lines = map(describe, nodes) if describe else nodes
+        self.message("Кайма после раскрытия вершины:", *lines, sep='\n')
+
+    def cutoff(self, node, limit):
+        self.message(f"Глубина вершины {node}\n"
+                     f"достигла лимита {limit} "
+                     "Поэтому дочерние вершины не раскрываются")
+
+
+class EventTracer(NullTracer):
+    """События — словари {"event": ..., ...}. Без stream копятся в
+    self.events, со stream пишутся в него по строке JSON на событие"""
+    enabled = True
+
+    def __init__(self, stream=None, size: int = board.SIZE):
+        self.stream = stream
+        self.size = size
+        self.events: list[dict] = []
+
+    def emit(self, event: dict):
+        if self.stream is None:
+            self.events.append(event)
+        else:
+            import json  # не нужен, пока события не пишутся в поток
+            self.stream.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+    def node_fields(self, node) -> dict:
+        fields = {
+            "id": node.id,
+            "parent": node.parent.id if node.parent else None,
+            "action": board.operator_name(node.action),
+            "depth": node.depth,
+            "path_cost": node.path_cost,
+            "state": board.cells(node.state, self.size),
+        }
+        h = getattr(node, 'h', None)
+        if h is not None:
+            fields["h"] = h
+        return fields
+
+    def expanding(self, node, describe=None):
+        node = describe(node) if describe else node
+        self.emit({"event": "expanding", "node": self.node_fields(node)})
+
+    def visited(self, state):
+        self.emit({"event": "visited",
+                   "state": board.cells(state, self.size)})
+
+    def children(self, children, describe=None):
+        self.emit({"event": "children", "nodes": [
+            self.node_fields(describe(child) if describe else child)
+            for child in children]})
+
+    def frontier(self, nodes, describe=None, estimation=None, label=None):
+        event = {"event": "frontier", "size": len(nodes)}
+        if estimation:
+            event["estimation"] = label
+            event["nodes"] = [
+                dict(self.node_fields(describe(node) if describe else node),
+                     estimation=estimation(node))
+                for node in nodes]
+        else:
+            event["nodes"] = [
+                self.node_fields(describe(node) if describe else node)
+                for node in nodes]
+        self.emit(event)
+
+    def cutoff(self, node, limit):
+        self.emit({"event": "cutoff", "node": self.node_fields(node),
+                   "limit": limit})
+
+
+def tracer(mode: str, rows: int = board.ROWS, cols: int = board.COLS):
+    """Трассировщик по прежнему режиму Problem: 'silent', 'fast', 'step'"""
+    if mode == 'silent':
+        return NullTracer()
+    return ConsoleTracer(step=mode == 'step', rows=rows, cols=cols)
@@ -0,0 +1,130 @@
+"""Компактное дерево поиска: вершина — индекс в параллельных массивах.
+
+Вместо объекта Node на каждую порожденную вершину хранятся только
+упакованное состояние, индекс родителя, код действия, глубина и позиция
+пустой клетки — 16 байт на вершину независимо от числа вершин. Состояние
+хранится в 64 битах, поэтому дерево годится для полей до 16 клеток (4x4).
+"""
+from array import array
+
+from npuzzle import board, permutation
+
+
+class SearchTree:
+    def __init__(self, rows: int = board.ROWS, cols: int = board.COLS):
+        if rows * cols * board.cell_bits(rows * cols) > 64:
+            raise ValueError(f"Поле {rows}x{cols} не помещается в 64 бита")
+        self.rows, self.cols = rows, cols
+        self.states = array('Q')  # упакованные состояния
+        self.parents = array('i')  # индекс родителя, -1 у корня
+        self.actions = array('b')  # код действия, -1 у корня
+        self.depths = array('H')  # глубина (она же стоимость пути)
+        self.blanks = array('B')  # индекс пустой клетки
+
+    def add(self, state: int, parent: int = -1, action: int = -1,
+            depth: int = 0, blank_pos: int | None = None) -> int:
+        """Добавление вершины, возвращает ее индекс"""
+        self.states.append(state)
+        self.parents.append(parent)
+        self.actions.append(action)
+        self.depths.append(depth)
+        self.blanks.append(blank_pos if blank_pos is not None
+                           else board.blank_index(state,
+                                                  self.rows * self.cols))
+        return len(self.states) - 1
+
+    def path(self, index: int) -> list[int]:
+        """Индексы вершин пути от корня до вершины index"""
+        path = []
+        while index != -1:
+            path.append(index)
+            index = self.parents[index]
+        path.reverse()
+        return path
+
+    def action(self, index: int) -> int | None:
+        action = self.actions[index]
+        return action if action != -1 else None
+
+    def node_str(self, index: int) -> str:
+        """Описание вершины в формате Node.__repr__"""
+        parent_id = self.parents[index] if self.parents[index] != -1 else None
+        return (f"Node ID: {index}, Parent ID: {parent_id}, "
+                f"Action: {board.operator_name(self.action(index))}, "
+                f"Path-Cost: {self.depths[index]}, "
+                f"Depth: {self.depths[index]}, "
+                f"State:\n"
+                f"{board.state_str(self.states[index], self.rows, self.cols)}")
+
+    def view(self, index: int) -> 'NodeView':
+        """Вершина с атрибутами Node — для трассировщиков (npuzzle.trace)"""
+        return NodeView(self, index)
+
+    def nbytes(self) -> int:
+        """Память, занятая буферами дерева"""
+        return sum(buffer.buffer_info()[1] * buffer.itemsize
+                   for buffer in (self.states, self.parents, self.actions,
+                                  self.depths, self.blanks))
+
+    def __len__(self):
+        return len(self.states)
+
+
+class NodeView:
+    """Вершина компактного дерева, представленная как Node: атрибуты
+    читаются из буферов дерева при обращении"""
+    __slots__ = ('tree', 'id')
+
+    def __init__(self, tree: SearchTree, index: int):
+        self.tree = tree
+        self.id = index
+
+    @property
+    def parent(self) -> 'NodeView | None':
+        parent = self.tree.parents[self.id]
+        return NodeView(self.tree, parent) if parent != -1 else None
+
+    @property
+    def action(self) -> int | None:
+        return self.tree.action(self.id)
+
+    @property
+    def depth(self) -> int:
+        return self.tree.depths[self.id]
+
+    path_cost = depth
+
+    @property
+    def state(self) -> int:
+        return self.tree.states[self.id]
+
+    @property
+    def blank_pos(self) -> int:
+        return self.tree.blanks[self.id]
+
+    def __repr__(self):
+        return self.tree.node_str(self.id)
+
+
+class VisitedBitmap:
+    """Множество посещенных состояний — бит на каждую перестановку клеток,
+    индекс — board.rank. Для 3x3 это 9!/8 = 45 360 байт на всё пространство
+    состояний"""
+
+    def __init__(self, size: int = board.SIZE):
+        self.size = size
+        self.bits = bytearray((permutation.arrangements(size, size) + 7) // 8)
+        self.count = 0
+
+    def add(self, state: int):
+        index = board.rank(state, self.size)
+        if not self.bits[index >> 3] & (1 << (index & 7)):
+            self.bits[index >> 3] |= 1 << (index & 7)
+            self.count += 1
+
+    def __contains__(self, state: int) -> bool:
+        index = board.rank(state, self.size)
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def __len__(self):
+        return self.count
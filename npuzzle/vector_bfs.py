@@ -0,0 +1,152 @@
+"""Поиск в ширину по слоям на NumPy.
+
+Слой — массив упакованных состояний (uint64) и массив позиций пустой
+клетки. Каждый оператор применяется сразу ко всему слою сдвигами и
+масками, новые состояния отсеиваются по битовой карте посещенных,
+индексированной рангом перестановки (board.rank). Код оператора, которым
+получено состояние, хранится в 2 битах по тому же рангу — по нему путь
+восстанавливается обратными ходами.
+
+Памяти нужно size!/8 байт на карту и size!/4 на коды операторов: для 3x3
+это 45 КБ и 91 КБ, для 3x4 — 60 МБ и 120 МБ. numpy — необязательная
+зависимость, нужна только этому модулю.
+"""
+from npuzzle import board, permutation
+
+try:
+    import numpy as np
+except ImportError:  # остальной пакет работает и без numpy
+    np = None
+
+
+class VectorBFS:
+    def __init__(self, start: int, rows: int = board.ROWS,
+                 cols: int = board.COLS, record_parents: bool = True,
+                 chunk: int = 1 << 20):
+        """record_parents=False отключает коды операторов (полный обход
+        ради размеров слоев), путь тогда не восстанавливается. chunk —
+        сколько вершин слоя раскрывается за один векторный шаг"""
+        if np is None:
+            raise ImportError("для VectorBFS нужен numpy: pip install numpy")
+        self.start = start
+        self.rows, self.cols = rows, cols
+        self.size = size = rows * cols
+        if size > 16:
+            raise ValueError("в uint64 помещается поле не больше 16 клеток")
+        self.record_parents = record_parents
+        self.chunk = chunk
+        count = permutation.arrangements(size, size)
+        self.visited = np.zeros((count + 7) // 8, dtype=np.uint8)
+        self.codes = (np.zeros((count + 3) // 4, dtype=np.uint8)
+                      if record_parents else None)
+        # targets[code][blank] — клетка, откуда приходит фишка, или -1
+        self.targets = np.full((len(board.OPERATORS), size), -1,
+                               dtype=np.int64)
+        for blank, moves in enumerate(board.move_table(rows, cols)):
+            for code, target in moves:
+                self.targets[code, blank] = target
+        self.layers: list[int] = []  # размеры слоев
+        self.count_new_states = 0  # количество полученных новых состояний
+        self.stored = 0  # посещенных состояний
+
+    def _ranks(self, states):
+        """board.rank для массива состояний: цифры кода Лемера — число
+        меньших значений правее позиции"""
+        size = self.size
+        digits = [((states >> np.uint64(board.BITS * i))
+                   & np.uint64(board.MASK)).astype(np.uint8)
+                  for i in range(size)]
+        ranks = np.zeros(len(states), dtype=np.uint64)
+        for i in range(size):
+            smaller = np.zeros(len(states), dtype=np.uint8)
+            for j in range(i + 1, size):
+                smaller += digits[j] < digits[i]
+            ranks = ranks * np.uint64(size - i) + smaller
+        return ranks
+
+    def _mark(self, ranks, codes):
+        np.bitwise_or.at(self.visited, ranks >> np.uint64(3),
+                         (np.uint8(1) << (ranks & np.uint64(7))
+                          ).astype(np.uint8))
+        if self.codes is not None:
+            np.bitwise_or.at(self.codes, ranks >> np.uint64(2),
+                             (codes.astype(np.uint8)
+                              << ((ranks & np.uint64(3)) * np.uint64(2))
+                              ).astype(np.uint8))
+
+    def _unvisited(self, ranks):
+        return ((self.visited[ranks >> np.uint64(3)]
+                 >> (ranks & np.uint64(7)).astype(np.uint8)) & 1) == 0
+
+    def run(self, goal: int | None = None
+            ) -> list[tuple[int, int | None]] | None:
+        """Обход слоями от start. Если задана цель — путь до нее (пары
+        (состояние, код действия)), иначе обход всего достижимого класса и
+        None; размеры слоев — в self.layers"""
+        if goal is not None and self.codes is None:
+            raise ValueError("путь не восстановить без record_parents")
+        if goal is not None and not board.solvable(self.start, goal,
+                                                   self.rows, self.cols):
+            raise Exception('нет решения !!!')
+        bits = np.uint64(board.BITS)
+        states = np.array([self.start], dtype=np.uint64)
+        blanks = np.array([board.blank_index(self.start, self.size)],
+                          dtype=np.int64)
+        ranks = self._ranks(states)
+        self._mark(ranks, np.zeros(1, dtype=np.uint8))
+        goal_rank = (board.rank(goal, self.size) if goal is not None
+                     else None)
+        while len(states):
+            self.layers.append(len(states))
+            self.stored += len(states)
+            if goal_rank is not None and (ranks == goal_rank).any():
+                return self._path(goal)
+            # потомки порождаются порциями по оператору и части слоя, чтобы
+            # временные массивы не росли вместе со слоем
+            found = [[], [], [], []]  # ранги, состояния, пустые, операторы
+            for first in range(0, len(states), self.chunk):
+                part_states = states[first:first + self.chunk]
+                part_blanks = blanks[first:first + self.chunk]
+                for code in range(len(board.OPERATORS)):
+                    targets = self.targets[code][part_blanks]
+                    legal = targets >= 0
+                    parent = part_states[legal]
+                    blank = part_blanks[legal].astype(np.uint64)
+                    target = targets[legal]
+                    shift = target.astype(np.uint64) * bits
+                    tile = (parent >> shift) & np.uint64(board.MASK)
+                    children = parent + (tile << (blank * bits)) - (
+                        tile << shift)
+                    self.count_new_states += len(children)
+                    child_ranks = self._ranks(children)
+                    fresh = self._unvisited(child_ranks)
+                    found[0].append(child_ranks[fresh])
+                    found[1].append(children[fresh])
+                    found[2].append(target[fresh])
+                    found[3].append(np.full(int(fresh.sum()), code,
+                                            np.uint8))
+            ranks, unique = np.unique(np.concatenate(found[0]),
+                                      return_index=True)
+            states = np.concatenate(found[1])[unique]
+            blanks = np.concatenate(found[2])[unique]
+            self._mark(ranks, np.concatenate(found[3])[unique])
+        return None
+
+    def _path(self, goal: int) -> list[tuple[int, int | None]]:
+        """Путь от start до goal обратными ходами по кодам операторов"""
+        path = []
+        state = goal
+        blank = board.blank_index(goal, self.size)
+        moves = board.move_table(self.rows, self.cols)
+        while state != self.start:
+            rank = board.rank(state, self.size)
+            code = (int(self.codes[rank >> 2]) >> ((rank & 3) * 2)) & 3
+            path.append((state, code))
+            # обратный оператор возвращает пустую клетку на прежнее место
+            inverse = board.INVERSE[code]
+            new_blank = next(target for op, target in moves[blank]
+                             if op == inverse)
+            state, blank = board.move(state, blank, new_blank), new_blank
+        path.append((state, None))
+        path.reverse()
+        return path
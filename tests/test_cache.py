@@ -0,0 +1,101 @@
+"""Ключи кэша решений: перенумерация, симметрии и повтор найденного пути"""
+import random
+
+import pytest
+
+from npuzzle import board, search
+from npuzzle.cache import SolutionCache, _symmetries
+
+GOAL_4X4 = [1, 2, 3, 4, 5, 0, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15]
+# у этих полей совпадали ключи, пока номер 16 упаковывался в 4 бита
+A = [12, 13, 3, 6, 8, 11, 7, 1, 4, 5, 0, 10, 14, 15, 9, 2]
+B = [12, 13, 3, 6, 8, 11, 7, 1, 4, 5, 15, 9, 14, 0, 10, 2]
+# решение A (не кратчайшее) жадным поиском с manhattan+linear_conflict
+PATH_A = ("dlluuurddlururrdllurrdllurdldrrdllluuurdldrrruldlurrulldddrul"
+          "urddluluurrdlulddrrruuldrdllluurrdluldrrdluldrrul")
+
+
+def replay(cells, actions, rows, cols):
+    """Поле после ходов пустой клетки actions (коды board.OPERATORS)"""
+    state, bits = board.pack([cells]), board.cell_bits(rows * cols)
+    blank = board.blank_index(state, rows * cols)
+    for action in actions:
+        dr, dc = board.STEPS[board.OPERATORS[action]]
+        r, c = divmod(blank, cols)
+        assert 0 <= r + dr < rows and 0 <= c + dc < cols
+        new_blank = (r + dr) * cols + c + dc
+        state, blank = board.move(state, blank, new_blank, bits), new_blank
+    return board.cells(state, rows * cols)
+
+
+def test_relabelled_16_does_not_collide():
+    cache = SolutionCache()
+    key = lambda cells: cache.key(board.pack([cells]),  # noqa: E731
+                                  board.pack([GOAL_4X4]), 4, 4)[0]
+    assert key(A) != key(B)
+
+
+def test_cached_path_replays_on_other_board():
+    actions = ["lurd".index(move) for move in PATH_A]
+    assert replay(A, actions, 4, 4) == GOAL_4X4
+    cache = SolutionCache()
+    cache.put(board.pack([A]), board.pack([GOAL_4X4]), actions, 4, 4)
+    # B — другое поле с той же целью: честный промах
+    assert cache.get(board.pack([B]), board.pack([GOAL_4X4]), 4, 4) is None
+    # зеркальная и перенумерованная пара A и цели — попадание
+    cells, _ = _symmetries(4, 4)[2]
+    label = [0] + list(range(15, 0, -1))
+    start, goal = [0] * 16, [0] * 16
+    for i, new in enumerate(cells):
+        start[new], goal[new] = label[A[i]], label[GOAL_4X4[i]]
+    got = cache.get(board.pack([start]), board.pack([goal]), 4, 4)
+    assert got is not None and len(got) == len(actions)
+    assert replay(start, got, 4, 4) == goal
+
+
+@pytest.mark.parametrize("rows, cols", [(3, 3), (2, 3), (3, 4), (4, 4)])
+def test_symmetric_relabelled_boards_share_solution(rows, cols):
+    rng = random.Random(rows * 10 + cols)
+    size = rows * cols
+    moves = board.move_table(rows, cols)
+    cache = SolutionCache()
+    for _ in range(5):
+        goal = list(range(size))
+        rng.shuffle(goal)
+        state, blank = board.pack([goal]), goal.index(0)
+        for _ in range(10):
+            _, new_blank = rng.choice(moves[blank])
+            state = board.move(state, blank, new_blank,
+                               board.cell_bits(size))
+            blank = new_blank
+        start = board.cells(state, size)
+        path = search.solve(search.grid(start, rows, cols),
+                            search.grid(goal, rows, cols))
+        cache.put(board.pack([start]), board.pack([goal]),
+                  [action for _, action in path[1:]], rows, cols)
+        for cells, _ in _symmetries(rows, cols):
+            names = list(range(1, size))
+            rng.shuffle(names)
+            label = {0: 0, **dict(zip(range(1, size), names))}
+            start2, goal2 = [0] * size, [0] * size
+            for i, new in enumerate(cells):
+                start2[new], goal2[new] = label[start[i]], label[goal[i]]
+            got = cache.get(board.pack([start2]), board.pack([goal2]),
+                            rows, cols)
+            assert got is not None and len(got) == len(path) - 1
+            assert replay(start2, got, rows, cols) == goal2
+
+
+def test_lru_eviction_and_disk_store(tmp_path):
+    first = ([1, 2, 3, 4, 0, 5, 6, 7, 8], [1, 2, 3, 4, 5, 0, 6, 7, 8], [2])
+    second = ([1, 2, 3, 4, 5, 0, 6, 7, 8], [1, 2, 3, 4, 5, 8, 6, 7, 0], [3])
+    cache = SolutionCache(1, str(tmp_path / "cache"))
+    for start, goal, actions in (first, second):
+        cache.put(board.pack([start]), board.pack([goal]), actions)
+    assert cache.evictions == 1
+    cache.close()
+    cache = SolutionCache(10, str(tmp_path / "cache"))
+    start, goal, actions = first
+    assert cache.get(board.pack([start]), board.pack([goal])) == actions
+    assert cache.disk_hits == 1
+    cache.close()
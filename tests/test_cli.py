@@ -0,0 +1,104 @@
+"""Записи NDJSON командной строки: статусы solved, unsolvable, budget,
+invalid и код возврата"""
+import io
+import json
+
+import pytest
+
+from npuzzle import board, cli
+
+GOAL = "1 2 3 4 0 5 6 7 8"
+START = "7 4 2 3 5 8 1 0 6"  # кратчайшее решение — 19 ходов
+SWAPPED = "2 1 3 4 0 5 6 7 8"  # другая четность
+
+
+def run(tmp_path, lines, *options):
+    """Код возврата и записи по строкам входа lines"""
+    path = tmp_path / "boards.txt"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    stdout = io.StringIO()
+    code = cli.main([str(path), "--goal", GOAL, *options], stdout=stdout)
+    return code, [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+def replay(start, moves, cols=3):
+    cells = list(start)
+    blank = cells.index(0)
+    for move in moves:
+        dr, dc = board.STEPS[move]
+        target = blank + dr * cols + dc
+        cells[blank], cells[target] = cells[target], 0
+        blank = target
+    return cells
+
+
+@pytest.mark.parametrize("algorithm", ["astar", "bfs", "iddfs", "idastar"])
+def test_solved(tmp_path, algorithm):
+    code, [record] = run(tmp_path, [START], "--algorithm", algorithm)
+    assert code == 0
+    assert record["status"] == "solved"
+    assert record["length"] == len(record["moves"]) == 19
+    assert replay(record["start"], record["moves"]) == record["goal"]
+
+
+def test_unsolvable_is_rejected_before_search(tmp_path):
+    code, [record] = run(tmp_path, [SWAPPED])
+    assert code == 1
+    assert record["status"] == "unsolvable"
+    assert record["expanded"] == 0
+
+
+@pytest.mark.parametrize("options", [
+    ("--max-nodes", "10"),
+    ("--algorithm", "iddfs", "--limit", "10"),  # решение глубже лимита
+    ("--algorithm", "idastar", "--max-nodes", "10"),
+])
+def test_budget(tmp_path, options):
+    code, [record] = run(tmp_path, [START], *options)
+    assert code == 1
+    assert record["status"] == "budget"
+    assert "error" in record
+
+
+@pytest.mark.parametrize("line", ["1 2 3", "1 1 2 3 4 5 6 7 8",
+                                  "1 2 3 4 x 5 6 7 8"])
+def test_invalid(tmp_path, line):
+    code, [record] = run(tmp_path, [line])
+    assert code == 1
+    assert record["status"] == "invalid"
+    assert "start" not in record
+
+
+def test_records_in_input_order(tmp_path):
+    lines = ["# комментарий", START, "", SWAPPED,
+             f"{GOAL} | {START}", "bad"]
+    code, records = run(tmp_path, lines)
+    assert code == 1
+    assert [record["index"] for record in records] == [0, 1, 2, 3]
+    assert [record["status"] for record in records] == [
+        "solved", "unsolvable", "solved", "invalid"]
+    # у строки со своей целью цель — после |
+    assert records[2]["goal"] == [int(tile) for tile in START.split()]
+
+
+def test_goal_tree_does_not_spend_search_budget(tmp_path):
+    code, [record] = run(tmp_path, [START], "--max-nodes", "2000")
+    assert record["status"] == "solved"
+    code, [record] = run(tmp_path, [START], "--max-nodes", "2000",
+                         "--goal-tree", "30000")
+    assert code == 0
+    assert record["status"] == "solved"
+    assert record["length"] == 19
+
+
+def test_infeasible_heuristic_is_invalid(tmp_path):
+    path = tmp_path / "boards.txt"
+    path.write_text(" ".join(map(str, list(range(1, 24)) + [0, 24])) + "\n",
+                    encoding="utf-8")
+    stdout = io.StringIO()
+    code = cli.main([str(path), "--heuristic", "walking_distance"],
+                    stdout=stdout)
+    record = json.loads(stdout.getvalue())
+    assert code == 1
+    assert record["status"] == "invalid"
+    assert "walking_distance" in record["error"]
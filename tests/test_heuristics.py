@@ -0,0 +1,78 @@
+"""Допустимость эвристик: h не больше точного расстояния из полной таблицы
+(npuzzle.distance) на случайных решаемых полях, пересчет после хода
+совпадает с полным вычислением"""
+import random
+from functools import lru_cache
+
+import pytest
+
+from npuzzle import board, distance, heuristics, instances, pdb
+
+NAMES = ["misplaced", "manhattan", "manhattan+linear_conflict",
+         "walking_distance"]
+SHAPES = [(3, 3), (2, 3), (2, 4), (4, 2)]
+
+
+def goal_for(rows, cols):
+    if (rows, cols) == (3, 3):
+        return instances.GOAL_8  # пустая клетка в центре, как в лабах
+    return board.pack([list(range(1, rows * cols)) + [0]])
+
+
+@lru_cache(maxsize=None)
+def exact(rows, cols) -> distance.DistanceTable:
+    """Полная таблица расстояний (строится в памяти, не в кэше на диске)"""
+    goal = goal_for(rows, cols)
+    return distance.DistanceTable(goal, distance.build(goal, rows, cols),
+                                  rows, cols)
+
+
+def random_states(table, count=300, seed=0):
+    """Случайные решаемые поля и их точные расстояния"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        index = rng.randrange(len(table.table))
+        yield table.state(index), table.table[index]
+
+
+def check(h, table, rows, cols):
+    moves = board.move_table(rows, cols)
+    bits = board.cell_bits(rows * cols)
+    rng = random.Random(1)
+    assert h(table.goal) == 0
+    for state, optimal in random_states(table):
+        value = h(state)
+        assert 0 <= value <= optimal
+        blank = board.blank_index(state, rows * cols)
+        _, target = rng.choice(moves[blank])
+        assert (h.update(value, state, blank, target)
+                == h(board.move(state, blank, target, bits)))
+
+
+@pytest.mark.parametrize("rows, cols", SHAPES)
+@pytest.mark.parametrize("name", NAMES)
+def test_admissible(name, rows, cols):
+    table = exact(rows, cols)
+    check(heuristics.heuristic(name, table.goal, rows, cols), table,
+          rows, cols)
+
+
+def test_pdb_admissible(tmp_path):
+    table = exact(3, 3)
+    for tiles in pdb.default_patterns(table.goal, 3, 3):
+        pdb.build(table.goal, 3, 3, tiles, tmp_path, log=lambda *_: None)
+    check(pdb.load(table.goal, 3, 3, directory=tmp_path), table, 3, 3)
+
+
+def test_manhattan_dominates_misplaced():
+    table = exact(3, 3)
+    h1 = heuristics.misplaced_tiles(table.goal)
+    h2 = heuristics.manhattan(table.goal)
+    h3 = heuristics.linear_conflict(table.goal, 3, 3)
+    for state, _ in random_states(table):
+        assert h1(state) <= h2(state) <= h3(state)
+
+
+def test_walking_distance_rejects_large_boards():
+    with pytest.raises(ValueError):
+        heuristics.walking_distance(goal_for(5, 5), 5, 5)
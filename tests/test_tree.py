@@ -0,0 +1,37 @@
+"""Компактное дерево поиска: по вершине на состояние, лимит и бюджеты"""
+import pytest
+
+from npuzzle import search
+
+GOAL = ((1, 2, 3), (4, 5, ' '))
+FAR = ((' ', 5, 4), (3, 2, 1))  # 2x3, решение есть
+
+
+def problem(**kwargs):
+    return search.Problem(FAR, GOAL, **kwargs)
+
+
+def test_one_tree_entry_per_state():
+    p = problem()
+    node = search.general_search(p, search.bfs, compact=True)
+    plain = search.general_search(problem(), search.bfs)
+    assert node.depth == plain.depth
+    states = p.tree.states
+    assert len(set(states)) == len(states) == len(p.visited)
+
+
+def test_limit_and_budgets():
+    depth = search.general_search(problem(), search.bfs, compact=True).depth
+    with pytest.raises(search.NoSolution):
+        search.general_search(problem(limit=depth - 1), search.bfs,
+                              compact=True)
+    assert search.general_search(problem(limit=depth), search.bfs,
+                                 compact=True).depth == depth
+    with pytest.raises(search.BudgetExceeded):
+        search.general_search(problem(max_nodes=10), search.bfs,
+                              compact=True)
+
+
+def test_only_breadth_first():
+    with pytest.raises(ValueError):
+        search.general_search(problem(), search.dfs_limited, compact=True)
@@ -0,0 +1,106 @@
+"""Пиковая память на порожденную вершину при полном обходе в ширину"""
+import sys
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from npuzzle import board, search  # noqa: E402
+from npuzzle.tree import SearchTree, VisitedBitmap  # noqa: E402
+
+goal_state = (
+    (1, 2, 3),
+    (4, ' ', 5),
+    (6, 7, 8)
+)
+
+
+class LegacyNode:
+    """Прежняя вершина: __dict__, операторы вычисляются сразу, действие —
+    строка"""
+    node_counter = 0
+
+    def __init__(self, state, parent=None, operator=None, path_cost=0, depth=0,
+                 blank_pos=None, h=0):
+        self.id = LegacyNode.node_counter
+        LegacyNode.node_counter += 1
+        self.state = state
+        self.blank_pos = (blank_pos if blank_pos is not None
+                          else board.blank_index(state))
+        self.operators = [(board.operator_name(code), new_blank)
+                          for code, new_blank in board.MOVES[self.blank_pos]]
+        self.parent = parent
+        self.action = operator
+        self.path_cost = path_cost
+        self.depth = depth
+
+    def move(self, new_blank_pos):
+        return board.move(self.state, self.blank_pos, new_blank_pos)
+
+    state_str = staticmethod(board.state_str)
+
+
+def full_bfs(node_cls):
+    """Обход всего пространства состояний из целевого. Листья сохраняются,
+    поэтому через ссылки на родителя живыми остаются все порожденные вершины,
+    как у дерева поиска, хранящего путь к каждой вершине"""
+    search.Node = node_cls  # Problem.expand создает search.Node
+    node_cls.node_counter = 0
+    problem = search.Problem(goal_state, goal_state)
+    tracemalloc.start()
+    start_time = time.time()
+    nodes = deque([node_cls(problem.init_state)])
+    leaves = []
+    while nodes:
+        node = nodes.popleft()
+        children = problem.expand(node, problem.moves[node.blank_pos])
+        nodes.extend(children)
+        if not children:
+            leaves.append(node)
+    end_time = time.time()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return node_cls.node_counter, peak, end_time - start_time
+
+
+def full_bfs_compact():
+    """Тот же обход в режиме компактного дерева (general_search(compact=True))
+    с той же битовой картой посещенных, что и compact_search для 3x3"""
+    problem = search.Problem(goal_state, goal_state)
+    tracemalloc.start()
+    start_time = time.time()
+    problem.visited = VisitedBitmap()
+    problem.visited.add(problem.init_state)
+    tree = SearchTree()
+    nodes = deque([tree.add(problem.init_state)])
+    while nodes:
+        nodes.extend(problem.expand_compact(tree, nodes.popleft()))
+    end_time = time.time()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"буферы дерева: {tree.nbytes() / 1024**2:.1f} MB, "
+          f"битовая карта visited: {len(problem.visited.bits) / 1024:.1f} "
+          f"KB, {len(problem.visited)} состояний")
+    return len(tree), peak, end_time - start_time
+
+
+def report(label, count, peak, elapsed):
+    print(f"{label:<10} узлов: {count}, "
+          f"пиковая память: {peak / 1024**2:.1f} MB, "
+          f"байт на узел: {peak / count:.0f}, "
+          f"время: {elapsed:.2f} секунд")
+
+
+def bench():
+    node_cls = search.Node
+    try:
+        for label, cls in (("__dict__", LegacyNode), ("__slots__", node_cls)):
+            report(label, *full_bfs(cls))
+    finally:
+        search.Node = node_cls
+    report("compact", *full_bfs_compact())
+
+
+if __name__ == "__main__":
+    bench()
@@ -1,142 +1,70 @@
-import time
-import tracemalloc
-
-
-class Node:
-    node_counter = 0
-
-    def __init__(self, state, parent, action, path_cost, depth):
-        self.id = Node.node_counter
-        Node.node_counter += 1
-        self.state = state
-        self.parent = parent  # Ссылка на родительский узел
-        self.action = action  # Действие, приведшее к этому узлу
-        self.path_cost = path_cost  # Стоимость пути
-        self.depth = depth  # Глубина
-
-    def __repr__(self):
-        parent_id = self.parent.id if self.parent else None
-        return (f"Node ID: {self.id}, Parent ID: {parent_id}, "
-                f"Action: {self.action}, Path-Cost: {self.path_cost}, "
-                f"Depth: {self.depth}, State:\n{self.state_str()}")
-
-    def state_str(self):
-        return '\n'.join(' '.join(str(cell) for cell in row)
-                         for row in self.state)
-
-
-def move(state, blank_pos, direction):
-    new_state = [list(row) for row in state]  # Создаем копию состояния
-    x, y = blank_pos
-    if direction == "up":
-        x, y = x - 1, y
-    elif direction == "down":
-        x, y = x + 1, y
-    elif direction == "left":
-        x, y = x, y - 1
-    elif direction == "right":
-        x, y = x, y + 1
-
-    new_state[blank_pos[0]][blank_pos[1]], new_state[x][y] = \
-        new_state[x][y], new_state[blank_pos[0]][blank_pos[1]]
-
-    return tuple(tuple(row) for row in new_state), (x, y)
-
-
-def get_actions(x, y):
-    actions = []
-    if x > 0:
-        actions.append("up")
-    if x < 2:
-        actions.append("down")
-    if y > 0:
-        actions.append("left")
-    if y < 2:
-        actions.append("right")
-    return actions
-
-
-def find_blank(state):
-    for i, row in enumerate(state):
-        for j, cell in enumerate(row):
-            if cell == 0:
-                return i, j
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from npuzzle import board  # noqa: E402
+from npuzzle.interactive import print_solution  # noqa: E402
+from npuzzle.metrics import Metrics  # noqa: E402
+from npuzzle.search import Node  # noqa: E402
+
+ORDER = ("up", "down", "left", "right")  # порядок перебора ходов
+
+
+def dfs(start, goal, metrics=None):
+    """metrics — куда записать счетчики, время и пиковую память (по
+    умолчанию создается новый Metrics). Размеры поля берутся из start"""
+    shape = (len(start), len(start[0]))
+    start, goal = board.pack(start), board.pack(goal)
+    if not board.solvable(start, goal, *shape):
+        print("Решения нет: начальное и целевое поля разной четности")
+        return None
+    metrics = metrics or Metrics(memory=True)  # tracemalloc на время поиска
+    with metrics.phase("search"):
+        solution = _dfs(start, goal, metrics, shape)
+    print(f"Итераций потребовалось: {metrics.expanded}, "
+          f"Время выполнения: {metrics.phases['search']['wall']:.4f} "
+          "секунд.")
+    if metrics.peak_memory is not None:
+        print(f"Пиковое использование памяти: "
+              f"{metrics.peak_memory / 1024**2:.4f} MB")
+    print(f"Всего создано узлов: {Node.node_counter}")
+    return solution
 
 
-def dfs(start, goal):
-    tracemalloc.start()  # Начало отслеживания памяти
-    start_time = time.time()
-    iterations = 0
-    start_node = Node(start, None, None, 0, 0)
+def _dfs(start, goal, metrics, shape):
+    moves = board.move_table(*shape, ORDER)
+    bits = board.cell_bits(shape[0] * shape[1])
+    start_node = Node(start, None, None, 0, 0, shape=shape)
     stack = [start_node]
     visited = set()
 
     while stack:
         current_node = stack.pop()
-        iterations += 1
+        metrics.expand(current_node.depth)
         current_state = current_node.state
 
         if current_state == goal:
-            end_time = time.time()
-            _, peak = tracemalloc.get_traced_memory()
-            tracemalloc.stop()
-            print(f"Итераций потребовалось: {iterations}, "
-                  f"Время выполнения: {end_time - start_time:.4f} секунд.")
-            print(f"Пиковое использование памяти: {peak / 1024**2:.4f} MB")
-            print(f"Всего создано узлов: {Node.node_counter}")
             return current_node
 
         visited.add(current_state)
-        blank_pos = find_blank(current_state)
-        for action in get_actions(*blank_pos):
-            new_state, new_blank_pos = move(current_state, blank_pos, action)
+        blank_pos = current_node.blank_pos
+        metrics.generated += len(moves[blank_pos])
+        for action, new_blank_pos in moves[blank_pos]:
+            new_state = board.move(current_state, blank_pos, new_blank_pos,
+                                   bits)
             if new_state not in visited:
                 child_node = Node(new_state, current_node, action,
                                   current_node.path_cost + 1,
-                                  current_node.depth + 1)
+                                  current_node.depth + 1,
+                                  new_blank_pos)
                 stack.append(child_node)
+            else:
+                metrics.duplicates += 1
+        metrics.observe(len(stack), len(visited))
 
-    end_time = time.time()
-    _, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()  # Остановка отслеживания памяти
-    print(f"Итераций потребовалось: {iterations}, "
-          f"Время выполнения: {end_time - start_time:.4f} секунд.")
-    print(f"Использование памяти: {peak / 1024**2:.4f} MB")
-    print(f"Всего создано узлов: {Node.node_counter}")
     return None
 
 
-def interactive_print(steps):
-    choice = input("Выберите опцию вывода:\n1) Вывести все сразу\n2) "
-                   "Выводить каждый шаг после нажатия Enter\nВаш выбор: ")
-    print("\nРешение:")
-    if choice == "1":
-        for step in steps:
-            print(step)
-            print("-" * 40)
-    elif choice == "2":
-        for step in steps:
-            input("Нажмите Enter для вывода следующего шага...")
-            print(step)
-            print("-" * 40)
-    else:
-        print("Некорректный выбор. Выводим все сразу.")
-        for step in steps:
-            print(step)
-            print("-" * 40)
-
-    print("Вывод завершен. Программа будет закрыта.")
-
-
-def print_solution(node):
-    path = []
-    while node:
-        path.append(node)
-        node = node.parent
-    path.reverse()
-    interactive_print(path)
-
-
 start_state = (
     (7, 4, 2),
     (3, 5, 8),
@@ -148,5 +76,6 @@ goal_state = (
     (6, 7, 8)
 )
 
-solution_node = dfs(start_state, goal_state)
-print_solution(solution_node)
\ No newline at end of file
+if __name__ == "__main__":
+    solution_node = dfs(start_state, goal_state)
+    print_solution(solution_node)
\ No newline at end of file
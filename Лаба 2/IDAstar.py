@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from npuzzle import board, heuristics  # noqa: E402
+from npuzzle.idastar import ida_star  # noqa: E402
+from npuzzle.interactive import ask_choice, print_path  # noqa: E402
+
+
+def print_iteration(iteration):
+    print("-"*40)
+    print(iteration)
+    print("-"*40)
+
+
+start_state = (
+    (7, 4, 2),
+    (3, 5, 8),
+    (1, ' ', 6)
+)
+goal_state = (
+    (1, 2, 3),
+    (4, ' ', 5),
+    (6, 7, 8)
+)
+
+# 15-puzzle: кайма A* с h2 на таких полях не помещается в память
+start_state_15 = (
+    (' ', 6, 1, 7),
+    (2, 4, 12, 3),
+    (5, 8, 13, 15),
+    (11, 9, 10, 14)
+)
+goal_state_15 = (
+    (1, 2, 3, 4),
+    (5, 6, 7, 8),
+    (9, 10, 11, 12),
+    (13, 14, 15, ' ')
+)
+
+
+if __name__ == "__main__":
+    choice = ask_choice("Выберите головоломку:\n"
+                        "1) 8-puzzle (3x3)\n"
+                        "2) 15-puzzle (4x4)\n"
+                        "Ваш выбор: ", ("1", "2"))
+    if choice == "1":
+        start, goal, rows, cols = start_state, goal_state, 3, 3
+    else:
+        start, goal, rows, cols = start_state_15, goal_state_15, 4, 4
+
+    names = list(heuristics.HEURISTICS)
+    choice = ask_choice("Выберите эвристику:\n" +
+                        "".join(f"{i}) {name}\n"
+                                for i, name in enumerate(names, 1)) +
+                        "Ваш выбор: ",
+                        [str(i) for i in range(1, len(names) + 1)])
+    name = names[int(choice) - 1]
+
+    start, goal = board.pack(start), board.pack(goal)
+    try:
+        solution = ida_star(start, goal,
+                            heuristics.heuristic(name, goal, rows, cols),
+                            rows, cols, on_iteration=print_iteration)
+        print("Решение найдено! Целевое состояние достигнуто.")
+        print_path(solution, rows, cols)
+    except Exception as e:
+        print(e)
@@ -0,0 +1,38 @@
+"""Пропускная способность пакетного решения в зависимости от числа
+процессов"""
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from npuzzle import batch, board  # noqa: E402
+
+goal_state = (
+    (1, 2, 3),
+    (4, ' ', 5),
+    (6, 7, 8)
+)
+
+
+def bench(count=10_000, algorithm="astar", heuristic="manhattan"):
+    goal = board.pack(goal_state)
+    rng = random.Random(0)
+    pairs = [(batch.random_solvable(goal, rng=rng), goal)
+             for _ in range(count)]
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start_time = time.perf_counter()
+        results = list(batch.solve_batch(pairs, algorithm, heuristic,
+                                         workers=workers))
+        elapsed = time.perf_counter() - start_time
+        errors = sum(result.error is not None for result in results)
+        print(f"процессов: {workers:>2}, задач: {len(results)}, "
+              f"ошибок: {errors}, время: {elapsed:.2f} секунд, "
+              f"задач в секунду: {len(results) / elapsed:.0f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    bench()
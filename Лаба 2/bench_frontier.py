@@ -0,0 +1,67 @@
+"""Сравнение пропускной способности каймы: полная пересортировка vs heapq"""
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from npuzzle import board, heuristics, search  # noqa: E402
+
+hard_state = (
+    (7, 4, 2),
+    (3, 5, 8),
+    (1, ' ', 6)
+)
+goal_state = (
+    (1, 2, 3),
+    (4, ' ', 5),
+    (6, 7, 8)
+)
+
+
+def sorted_frontier(h, with_depth):
+    """Прежняя функция очереди: пересортировка всей каймы на каждом шаге с
+    пересчетом эвристики h(state, goal) для каждого узла"""
+    goal = board.pack(goal_state)
+
+    def key(node):
+        return h(node.state, goal) + (node.depth if with_depth else 0)
+
+    def queuing_fn(nodes, children):
+        nodes.extend(children)
+        return deque(sorted(nodes, key=key))
+    return queuing_fn
+
+
+def run(heuristic, queuing_fn):
+    search.Node.node_counter = 0
+    problem = search.Problem(hard_state, goal_state, heuristic=heuristic)
+    start_time = time.perf_counter()
+    solution = search.general_search(problem, queuing_fn)
+    elapsed = time.perf_counter() - start_time
+    return solution.depth, search.Node.node_counter, elapsed
+
+
+def bench():
+    cases = [
+        ("A* h1", "misplaced", search.A_star,
+         sorted_frontier(heuristics.h1, True)),
+        ("A* h2", "manhattan", search.A_star,
+         sorted_frontier(heuristics.h2, True)),
+        ("greedy h1", "misplaced", search.greedy,
+         sorted_frontier(heuristics.h1, False)),
+        ("greedy h2", "manhattan", search.greedy,
+         sorted_frontier(heuristics.h2, False)),
+    ]
+    print(f"{'алгоритм':<10} {'кайма':<7} {'длина':>5} {'узлов':>8} "
+          f"{'время, с':>9} {'узлов/с':>9}")
+    for name, heuristic, queuing_fn, resort in cases:
+        for label, fn in (("sorted", resort),
+                          ("heapq", queuing_fn)):
+            depth, nodes, elapsed = run(heuristic, fn)
+            print(f"{name:<10} {label:<7} {depth:>5} {nodes:>8} "
+                  f"{elapsed:>9.3f} {nodes / elapsed:>9.0f}")
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,52 @@
+"""Последовательный A* против параллельного HDA* на 15-puzzle"""
+import os
+import random
+import time
+
+import IDAstar
+from IDAstar import board, heuristics
+from npuzzle.astar import AStar
+from npuzzle.hdastar import HDAStar
+
+
+def random_walk(goal, length, rng, rows=4, cols=4):
+    """Поле на расстоянии не больше length ходов от цели (случайные ходы
+    без немедленного возврата)"""
+    moves = board.move_table(rows, cols)
+    state, blank = goal, board.blank_index(goal, rows * cols)
+    previous = None
+    for _ in range(length):
+        _, new_blank = rng.choice([move for move in moves[blank]
+                                   if move[1] != previous])
+        previous = blank
+        state, blank = board.move(state, blank, new_blank), new_blank
+    return state
+
+
+def bench(heuristic="manhattan+linear_conflict"):
+    goal = board.pack(IDAstar.goal_state_15)
+    rng = random.Random(0)
+    instances = [board.pack(IDAstar.start_state_15)]
+    instances += [random_walk(goal, 60, rng) for _ in range(3)]
+    for start in instances:
+        start_time = time.perf_counter()
+        search = AStar(start, goal,
+                       heuristics.heuristic(heuristic, goal, 4, 4), 4, 4)
+        length = len(search.run()) - 1
+        serial = time.perf_counter() - start_time
+        print(f"длина {length}: A* {serial:.2f} секунд, "
+              f"новых состояний {search.count_new_states}")
+        workers = 1
+        while workers <= max(os.cpu_count() or 1, 2):
+            start_time = time.perf_counter()
+            search = HDAStar(start, goal, heuristic, 4, 4, workers)
+            assert len(search.run()) - 1 == length
+            elapsed = time.perf_counter() - start_time
+            print(f"    HDA*, процессов {workers}: {elapsed:.2f} секунд, "
+                  f"ускорение {serial / elapsed:.2f}, "
+                  f"новых состояний {search.count_new_states}")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,81 @@
+"""Количество вершин A*, жадного поиска и IDA* для каждой эвристики"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from npuzzle import board, heuristics, search  # noqa: E402
+from npuzzle.idastar import ida_star  # noqa: E402
+
+start_state = (
+    (7, 4, 2),
+    (3, 5, 8),
+    (1, ' ', 6)
+)
+goal_state = (
+    (1, 2, 3),
+    (4, ' ', 5),
+    (6, 7, 8)
+)
+start_state_15 = (
+    (' ', 6, 1, 7),
+    (2, 4, 12, 3),
+    (5, 8, 13, 15),
+    (11, 9, 10, 14)
+)
+goal_state_15 = (
+    (1, 2, 3, 4),
+    (5, 6, 7, 8),
+    (9, 10, 11, 12),
+    (13, 14, 15, ' ')
+)
+
+
+def run_general(queuing_fn, name, start, goal):
+    search.Node.node_counter = 0
+    problem = search.Problem(start, goal, heuristic=name)
+    start_time = time.perf_counter()
+    solution = search.general_search(problem, queuing_fn)
+    return (solution.depth, search.Node.node_counter,
+            time.perf_counter() - start_time)
+
+
+def run_ida(name, start, goal, rows, cols):
+    iterations = []
+    start, goal = board.pack(start), board.pack(goal)
+    h = heuristics.heuristic(name, goal, rows, cols)
+    start_time = time.perf_counter()
+    path = ida_star(start, goal, h, rows, cols,
+                    on_iteration=iterations.append)
+    return (len(path) - 1, sum(it.count_new_states for it in iterations),
+            time.perf_counter() - start_time)
+
+
+def bench():
+    cases = [
+        ("A* 3x3", lambda name: run_general(
+            search.A_star, name, start_state, goal_state)),
+        ("greedy 3x3", lambda name: run_general(
+            search.greedy, name, start_state, goal_state)),
+        ("IDA* 3x3", lambda name: run_ida(
+            name, start_state, goal_state, 3, 3)),
+        ("IDA* 4x4", lambda name: run_ida(
+            name, start_state_15, goal_state_15, 4, 4)),
+    ]
+    print(f"{'алгоритм':<11} {'эвристика':<26} {'длина':>5} {'вершин':>9} "
+          f"{'время, с':>9}")
+    for label, run in cases:
+        for name in heuristics.HEURISTICS:
+            if label == "IDA* 4x4" and name == "misplaced":
+                continue  # слишком слабая эвристика для 4x4
+            try:
+                depth, nodes, elapsed = run(name)
+            except FileNotFoundError as e:  # база шаблонов не построена
+                print(f"{label:<11} {name:<26} {e}")
+                continue
+            print(f"{label:<11} {name:<26} {depth:>5} {nodes:>9} "
+                  f"{elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    bench()
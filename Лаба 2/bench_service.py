@@ -0,0 +1,72 @@
+"""Задержки асинхронного решателя (npuzzle.service) под одновременной
+нагрузкой: клиенты шлют запросы по HTTP через Unix-сокет, часть запросов
+повторяется и объединяется с уже идущими вычислениями или берется из кэша
+решений (cache_size=0 — без кэша)"""
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from npuzzle import board, instances, service  # noqa: E402
+from npuzzle.cache import SolutionCache  # noqa: E402
+
+
+async def request(socket_path, method, path, payload=None) -> dict:
+    """Запрос HTTP/1.1 к серверу на Unix-сокете"""
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.partition(b"\r\n\r\n")[2])
+
+
+async def bench(count=400, clients=32, distinct=40, workers=None,
+                cache_size=1000):
+    rng = random.Random(0)
+    cases = rng.sample(instances.random8(per_depth=20), distinct)
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = str(Path(directory) / "npuzzle.sock")
+        cache = SolutionCache(cache_size) if cache_size else None
+        async with service.SolverService(workers, max_seconds=5,
+                                         cache=cache) as solver:
+            server = await service.serve(solver, unix=socket_path)
+            queue = [rng.choice(cases) for _ in range(count)]
+
+            async def client():
+                while queue:
+                    case = queue.pop()
+                    record = await request(socket_path, "POST", "/solve", {
+                        "start": board.cells(case.start),
+                        "goal": board.cells(case.goal)})
+                    assert record["length"] == case.optimal, record
+
+            start_time = time.perf_counter()
+            await asyncio.gather(*(client() for _ in range(clients)))
+            elapsed = time.perf_counter() - start_time
+            stats = await request(socket_path, "GET", "/stats")
+            server.close()
+            await server.wait_closed()
+    latency = stats["latency"]
+    print(f"запросов: {stats['requests']}, объединено: "
+          f"{stats['coalesced']}, процессов: {stats['workers']}, "
+          f"клиентов: {clients}, время: {elapsed:.2f} секунд, "
+          f"запросов в секунду: {count / elapsed:.0f}")
+    print(f"задержка p50: {latency['p50'] * 1000:.1f} мс, "
+          f"p95: {latency['p95'] * 1000:.1f} мс, "
+          f"max: {latency['max'] * 1000:.1f} мс, "
+          f"раскрыто вершин: {stats['metrics']['expanded']}")
+    if stats["cache"]:
+        print(f"кэш: попаданий {stats['cache']['hits']}, "
+              f"промахов {stats['cache']['misses']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(bench())
+    asyncio.run(bench(cache_size=0))
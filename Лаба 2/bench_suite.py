@@ -0,0 +1,39 @@
+"""Алгоритмы обеих лабораторных на наборах задач npuzzle.bench: A* и
+жадный поиск через general_search вместе с алгоритмами npuzzle.bench
+(поиск в ширину, итеративное углубление dfs_limited, astar/greedy/idastar
+пакета).
+
+    python bench_suite.py run --heuristics misplaced,manhattan
+    python bench_suite.py run --algorithms bfs,A_star --output run.json
+    python bench_suite.py compare old.json run.json
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from npuzzle import bench, board, search  # noqa: E402
+
+
+def general(queuing_fn):
+    """Solver поверх search.general_search (поля только 3x3)"""
+    def run(instance, heuristic, metrics):
+        problem = search.Problem(board.unpack(instance.start),
+                                 board.unpack(instance.goal),
+                                 heuristic=heuristic, metrics=metrics)
+        return search.general_search(problem, queuing_fn).depth
+    return bench.Solver(run, sizes={(3, 3)})
+
+
+SOLVERS = {
+    "bfs": bench.SOLVERS["bfs"],
+    "dfs_limited": bench.SOLVERS["dfs_limited"],
+    "A_star": general(search.A_star),
+    "greedy": general(search.greedy),
+    "npuzzle.astar": bench.SOLVERS["astar"],
+    "npuzzle.greedy": bench.SOLVERS["greedy"],
+    "idastar": bench.SOLVERS["idastar"],
+}
+
+
+if __name__ == "__main__":
+    sys.exit(bench.main(solvers=SOLVERS))